@@ -0,0 +1,76 @@
+"""Renders a 15 + 200 list: the previous uncached renderer vs cold caches, a render after one member joined,
+and warm caches."""
+from types import SimpleNamespace
+
+from common import load_bot, per_call, us
+
+MAIN, RESERVE = 15, 200
+REPEAT = 2000
+
+locales = {"en": {"list_header": "**Turf list**", "list_empty": "-", "list_footer": "Click a button below.",
+                  "list_locked_footer": "This list is locked.", "list_main_title": "**Main ({count}/{max})**",
+                  "list_reserve_title": "**Reserve ({count})**"}}
+bot = load_bot({"locales.json": locales})
+localizer = bot.localizer
+manager = bot.list_manager
+
+
+class BenchMember:
+    __slots__ = ("id",)
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+def previous_render(guild, list_data) -> str:
+    # The renderer before the caches: two member lookups per entry and every localized string fetched per render
+    gid = guild.id
+    header = f"{localizer.get_string(gid, 'list_header')}\n"
+    main_list = [f"{i+1}. {guild.get_member(uid).mention if guild.get_member(uid) else f'ID: {uid}'}" for i, uid in enumerate(list_data["main"])]
+    reserve_list = [f"{i+1}. {guild.get_member(uid).mention if guild.get_member(uid) else f'ID: {uid}'}" for i, uid in enumerate(list_data["reserve"])]
+    main_title = localizer.get_string(gid, "list_main_title", count=len(main_list), max=list_data["max_slots"])
+    main_content = "\n".join(main_list) or localizer.get_string(gid, "list_empty")
+    reserve_title = localizer.get_string(gid, "list_reserve_title", count=len(reserve_list))
+    reserve_content = "\n".join(reserve_list) or localizer.get_string(gid, "list_empty")
+    footer = f"\n\n{localizer.get_string(gid, 'list_locked_footer' if list_data.get('locked', False) else 'list_footer')}"
+    return f"{header}\n{main_title}\n{main_content}\n\n{reserve_title}\n{reserve_content}{footer}"
+
+
+def main():
+    members = {user_id: BenchMember(user_id) for user_id in range(1, MAIN + RESERVE + 1)}
+    guild = SimpleNamespace(id=77, get_member=members.get)
+    list_id, list_data = manager.create_list(guild.id)
+    for user_id in range(1, MAIN + 1): list_data["main"].append(user_id)
+    for user_id in range(MAIN + 1, MAIN + RESERVE + 1): list_data["reserve"].append(user_id)
+    assert previous_render(guild, list_data) == manager.generate_list_content_string(guild, list_id)
+
+    def cold():
+        manager._member_lines.pop(guild.id, None)
+        manager._sections.pop(list_id, None)
+        manager._fragments.clear()
+        return manager.generate_list_content_string(guild, list_id)
+
+    def one_joined():
+        # A reserve member leaves and joins again: the main section and every other member line are reused
+        list_data["reserve"].remove(MAIN + 1)
+        list_data["reserve"].append(MAIN + 1)
+        return manager.generate_list_content_string(guild, list_id)
+
+    previous = per_call(lambda: previous_render(guild, list_data), REPEAT)
+    cold_render = per_call(cold, REPEAT)
+    incremental = per_call(one_joined, REPEAT)
+    warm_render = per_call(lambda: manager.generate_list_content_string(guild, list_id), REPEAT)
+    print(f"{MAIN} + {RESERVE} list, per render")
+    print(f"previous     {us(previous)}")
+    print(f"cold cache   {us(cold_render)}")
+    print(f"one joined   {us(incremental)}")
+    print(f"warm cache   {us(warm_render)}")
+    print("An unchanged render matches the posted content and sends no edit at all.")
+
+
+if __name__ == "__main__":
+    main()
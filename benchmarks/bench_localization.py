@@ -0,0 +1,41 @@
+"""get_string with and without kwargs, compiled catalogs vs the previous per-call lookup and str.format."""
+from common import load_bot, per_call, us
+
+KEYS = 300
+REPEAT = 200_000
+
+locales = {lang: {**{f"plain_{i}": f"{lang} text {i}" for i in range(KEYS)},
+                  **{f"fmt_{i}": f"{lang} {{count}}/{{max}} slots {i}" for i in range(KEYS)}}
+           for lang in ("en", "de")}
+del locales["de"]["plain_7"] # Falls back to English
+bot = load_bot({"locales.json": locales})
+localizer = bot.localizer
+GUILD_ID = 1234
+localizer.set_language(GUILD_ID, "de")
+
+
+def previous_get_string(guild_id, key, **kwargs):
+    # The lookup get_string did before catalogs were compiled
+    lang = localizer._settings.get(str(guild_id), {}).get("language", "en")
+    string = localizer._locales.get(lang, {}).get(key)
+    if string is None:
+        string = localizer._locales.get("en", {}).get(key, f"[Translation missing for key: '{key}']")
+    return string.format(**kwargs)
+
+
+def main():
+    cases = {
+        "no kwargs": (("plain_42",), {}),
+        "no kwargs, en fallback": (("plain_7",), {}),
+        "with kwargs": (("fmt_42",), {"count": 3, "max": 15}),
+    }
+    print(f"{'case':<24} {'previous':>12} {'compiled':>12}")
+    for name, (args, kwargs) in cases.items():
+        assert previous_get_string(GUILD_ID, *args, **kwargs) == localizer.get_string(GUILD_ID, *args, **kwargs)
+        previous = per_call(lambda: previous_get_string(GUILD_ID, *args, **kwargs), REPEAT)
+        compiled = per_call(lambda: localizer.get_string(GUILD_ID, *args, **kwargs), REPEAT)
+        print(f"{name:<24} {us(previous)} {us(compiled)}")
+
+
+if __name__ == "__main__":
+    main()
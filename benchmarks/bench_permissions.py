@@ -0,0 +1,77 @@
+"""PermissionsManager.check with 250 guild roles and 500 rules, compiled index vs the previous per-call scan."""
+import random
+from types import SimpleNamespace
+
+import discord
+
+from common import load_bot, per_call, us
+
+bot = load_bot()
+
+GUILD_ID = 1
+ROLE_COUNT = 250
+RULE_COUNT = 500
+MEMBER_ROLES = 40
+COMMANDS = [f"command_{i}" for i in range(25)]
+REPEAT = 100_000
+
+
+class BenchMember(discord.Member):
+    # Plain attributes in place of the gateway-backed properties
+    id = roles = guild_permissions = None
+
+    def __init__(self, user_id: int, roles: list):
+        self.id = user_id
+        self.roles = roles
+        self.guild_permissions = SimpleNamespace(administrator=False)
+        self._role_ids = {role.id for role in roles}
+
+    def get_role(self, role_id: int):
+        return role_id in self._role_ids or None
+
+
+def previous_check(manager, interaction) -> bool:
+    # The check as it ran before the index: string keys and a sort of the member's roles per call
+    guild_perms = manager.permissions.get(str(interaction.guild.id))
+    if not guild_perms: return False
+    user, command_name = interaction.user, interaction.command.name
+    user_rule = guild_perms.get("users", {}).get(str(user.id), {}).get(command_name)
+    if user_rule is not None: return user_rule == "allow"
+    for role in sorted(user.roles, key=lambda r: r.position, reverse=True):
+        role_rule = guild_perms.get("roles", {}).get(str(role.id), {}).get(command_name)
+        if role_rule is not None: return role_rule == "allow"
+    return False
+
+
+def main():
+    rng = random.Random(10)
+    roles = [SimpleNamespace(id=GUILD_ID if i == 0 else 10_000 + i, position=i) for i in range(ROLE_COUNT)]
+    roles_by_id = {role.id: role for role in roles}
+    guild = SimpleNamespace(id=GUILD_ID, get_role=roles_by_id.get)
+    guild_perms = {"roles": {}, "users": {}}
+    for _ in range(RULE_COUNT):
+        # Mostly role rules on low roles, a few per-user overrides
+        if rng.random() < 0.9:
+            target = guild_perms["roles"].setdefault(str(rng.choice(roles[:ROLE_COUNT // 2]).id), {})
+        else:
+            target = guild_perms["users"].setdefault(str(rng.randrange(100)), {})
+        target[rng.choice(COMMANDS)] = rng.choice(("allow", "deny"))
+
+    manager = bot.permissions_manager
+    manager.permissions[str(GUILD_ID)] = guild_perms
+    manager.invalidate_index(GUILD_ID)
+    member = BenchMember(5_000, [roles[0], *rng.sample(roles[1:], MEMBER_ROLES - 1)]) # Every member holds @everyone
+    interactions = [SimpleNamespace(guild=guild, user=member, command=SimpleNamespace(name=name)) for name in COMMANDS]
+    assert [previous_check(manager, i) for i in interactions] == [manager.check(i) for i in interactions]
+
+    index_build = per_call(lambda: bot.GuildPermissionIndex(guild, guild_perms), 200)
+    previous = per_call(lambda: [previous_check(manager, i) for i in interactions], REPEAT // len(COMMANDS)) / len(COMMANDS)
+    indexed = per_call(lambda: [manager.check(i) for i in interactions], REPEAT // len(COMMANDS)) / len(COMMANDS)
+    print(f"{ROLE_COUNT} roles, {RULE_COUNT} rules, member with {MEMBER_ROLES} roles")
+    print(f"previous check   {us(previous)}")
+    print(f"indexed check    {us(indexed)}")
+    print(f"index rebuild    {us(index_build)} (only after a rule or role change)")
+
+
+if __name__ == "__main__":
+    main()
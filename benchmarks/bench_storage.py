@@ -0,0 +1,39 @@
+"""Write latency of a single list mutation, JSON (whole-file rewrite) vs SQLite (one row), as the guild count grows."""
+import random
+
+from common import load_bot, per_call, us
+
+bot = load_bot()
+
+GUILD_COUNTS = (10, 100, 1000, 5000)
+STORE = "bench_lists.json"
+
+
+def make_lists(guild_count: int) -> dict:
+    rng = random.Random(guild_count)
+    return {str(guild_id): {"guild_id": guild_id, "channel_id": rng.getrandbits(60), "message_id": rng.getrandbits(60),
+                            "main": [rng.getrandbits(60) for _ in range(15)], "reserve": [rng.getrandbits(60) for _ in range(20)],
+                            "locked": False, "max_slots": 15}
+            for guild_id in range(guild_count)}
+
+
+def main():
+    json_backend = bot.JsonStorageBackend()
+    sqlite_backend = bot.SqliteStorageBackend("bench_state.db", [])
+    print(f"{'guilds':>7} {'json':>12} {'sqlite':>12}")
+    for guild_count in GUILD_COUNTS:
+        data = make_lists(guild_count)
+        for backend in (json_backend, sqlite_backend):
+            backend.write(STORE, data)
+        key = str(guild_count // 2)
+        repeat = max(20, 20000 // guild_count)
+
+        def mutate():
+            data[key]["main"].append(data[key]["main"].pop(0)) # One click on one guild's list
+
+        timings = [per_call(lambda: (mutate(), backend.write(STORE, data, {key})), repeat) for backend in (json_backend, sqlite_backend)]
+        print(f"{guild_count:>7} {us(timings[0])} {us(timings[1])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Throughput and error rate of parse_turf_message on a corpus of well-formed and mutated turf reports,
+compared with the previous multi-pass parser."""
+import random
+import time
+
+from common import load_bot
+
+bot = load_bot()
+
+WELL_FORMED = 2000
+MUTATED = 20000
+ATTACKERS = ["los santos vagos", "Ballas", "mc Bikers e.v.", "the lost mc", "Marabunta Grande", "Triaden GmbH"]
+ZONES = ["Grove Street", "Vinewood Hills", "Sandy Shores", "Paleto Bay", "Del Perro Pier"]
+
+
+def report(rng: random.Random) -> str:
+    return (f"⚔️ Auf eure Organisation wurde ein Angriff gestartet!\n"
+            f"Angriff von {rng.choice(ATTACKERS)} verübt.\n"
+            f"Beginn: {rng.randint(1, 28):02}.10.2026 {rng.randint(0, 23):02}:{rng.randint(0, 59):02}:00\n"
+            f"Zonenname: {rng.choice(ZONES)}\n"
+            f"Zonennummer: {rng.randint(1, 60)}")
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    for _ in range(rng.randint(1, 4)):
+        kind = rng.randrange(5)
+        lines = text.splitlines()
+        if kind == 0 and len(text) > 1: # Truncated message
+            text = text[:rng.randrange(len(text))]
+        elif kind == 1 and lines: # Missing line
+            del lines[rng.randrange(len(lines))]
+            text = "\n".join(lines)
+        elif kind == 2 and text: # Dropped character, e.g. "Angriff von" without " ver"
+            i = rng.randrange(len(text))
+            text = text[:i] + text[i + 1:]
+        elif kind == 3: # Stray whitespace or blank lines
+            i = rng.randrange(len(text) + 1)
+            text = text[:i] + rng.choice([" ", "\n", "\t", "\n\n"]) + text[i:]
+        elif lines: # Line cut after its label
+            i = rng.randrange(len(lines))
+            lines[i] = lines[i].split(" ", 1)[0]
+            text = "\n".join(lines)
+    return text
+
+
+def previous_parse(msg):
+    # The parser before the single compiled pass
+    if "Auf eure Organisation" not in msg: return None
+    lines = msg.splitlines()
+    attacker = next((l.split("Angriff von ")[1].split(" ver")[0].strip() for l in lines if "Angriff von" in l), "Unknown")
+    begin = next((l.split()[-1][:5] for l in lines if l.startswith("Beginn:")), "??:??")
+    zonename = next((l.split(":", 1)[1].strip() for l in lines if l.startswith("Zonenname:")), "Unknown")
+    zonenumber = next((l.split(":", 1)[1].strip() for l in lines if l.startswith("Zonennummer:")), "Unknown")
+    return {"attacker": bot.fix_attacker_casing(attacker), "begin": begin, "zonename": zonename, "zonenumber": zonenumber}
+
+
+def measure(parse, corpus):
+    results, errors = [], 0
+    start = time.perf_counter()
+    for msg in corpus:
+        try:
+            results.append(parse(msg))
+        except Exception:
+            results.append(errors)
+            errors += 1
+    return len(corpus) / (time.perf_counter() - start), errors, results
+
+
+def main():
+    rng = random.Random(23)
+    well_formed = [report(rng) for _ in range(WELL_FORMED)]
+    corpus = {"well-formed": well_formed, "mutated": [mutate(rng, rng.choice(well_formed)) for _ in range(MUTATED)]}
+    print(f"{'corpus':<12} {'parser':<9} {'msg/s':>10} {'errors':>8} {'agree':>7}")
+    for name, messages in corpus.items():
+        old_rate, old_errors, old_results = measure(previous_parse, messages)
+        new_rate, new_errors, new_results = measure(bot.parse_turf_message, messages)
+        comparable = [(old, new) for old, new in zip(old_results, new_results) if not isinstance(old, int)]
+        agree = sum(old == (new._asdict() if new else None) for old, new in comparable) / max(len(comparable), 1)
+        print(f"{name:<12} {'previous':<9} {old_rate:>10.0f} {old_errors / len(messages):>8.2%}")
+        print(f"{'':<12} {'compiled':<9} {new_rate:>10.0f} {new_errors / len(messages):>8.2%} {agree:>7.2%}")
+
+
+if __name__ == "__main__":
+    main()
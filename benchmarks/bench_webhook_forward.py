@@ -0,0 +1,82 @@
+"""Forwards a burst of 200 messages to a local stub webhook server: a new session per message (previous handler)
+vs the bot's shared keep-alive session, and through the webhook dispatch queue. Plain HTTP on localhost, so the
+TLS handshakes the shared session saves against Discord are not even part of these numbers."""
+import asyncio
+import time
+
+import aiohttp
+import discord
+from aiohttp import web
+
+from common import load_bot
+
+bot = load_bot()
+
+BURST = 200
+WEBHOOK_URL = "https://discord.com/api/webhooks/123456789012345678/" + "b" * 68
+
+
+async def start_stub_server():
+    peers: set = set()
+    posts: list = []
+
+    async def execute_webhook(request: web.Request):
+        peers.add(request.transport.get_extra_info("peername"))
+        posts.append(await request.read())
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/api/v10/webhooks/{webhook_id}/{token}", execute_webhook)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    discord.http.Route.BASE = f"http://127.0.0.1:{port}/api/v10"
+    return runner, peers, posts
+
+
+async def previous_forward(content: str):
+    # What the handler did before: a fresh session, connection and Webhook per message
+    async with aiohttp.ClientSession() as session:
+        await discord.Webhook.from_url(WEBHOOK_URL, session=session).send(content, username="Telegram (bench)")
+
+
+async def shared_forward(content: str):
+    await bot.bot.get_webhook(WEBHOOK_URL).send(content, username="Telegram (bench)")
+
+
+async def run(name: str, forward, peers: set, posts: list):
+    peers.clear()
+    posts.clear()
+    start = time.perf_counter()
+    for i in range(BURST):
+        await forward(f"turf report {i}")
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} {elapsed * 1000:8.1f} ms  {elapsed / BURST * 1000:6.2f} ms/msg  {len(posts):4} posts  {len(peers):4} connections")
+
+
+async def main():
+    runner, peers, posts = await start_stub_server()
+    print(f"{BURST} messages forwarded one after another")
+    await run("new session", previous_forward, peers, posts)
+    await run("shared session", shared_forward, peers, posts)
+
+    # The queue answers the handler immediately; a burst that piles up goes out as merged posts
+    queue = bot.bot.get_webhook_queue(WEBHOOK_URL)
+
+    async def queued_forward(content: str):
+        queue.put(content, username="Telegram (bench)")
+        await asyncio.sleep(0) # Lets the worker run between messages, as separate Telegram events would
+
+    await run("dispatch queue", queued_forward, peers, posts)
+    start = time.perf_counter()
+    await queue.drain(30)
+    print(f"{'':<16} drained in {(time.perf_counter() - start) * 1000:.1f} ms: {len(posts)} posts, {len(peers)} connections; {queue}")
+
+    await bot.bot.http_session.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+"""Shared setup for the benchmark scripts. Run them from the repository root, e.g. `python benchmarks/bench_storage.py`."""
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_bot(files: dict[str, object] | None = None):
+    """Imports bot.py inside a scratch directory, so its state files never touch the checkout.
+    `files` are JSON files written there first, e.g. a locales.json."""
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="epic-bot-bench-"))
+    for name, data in (files or {}).items():
+        with open(name, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    import bot
+    return bot
+
+
+def per_call(fn, repeat: int) -> float:
+    """Average seconds per call of fn() over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def us(seconds: float) -> str:
+    return f"{seconds * 1e6:9.2f} us"
@@ -4,10 +4,20 @@ import json
 import os
 import sys
 import datetime
+import gzip
+import heapq
+import itertools
 import traceback
 import aiohttp
 import re
+import shutil
+import sqlite3
+import threading
+import time
+from collections import deque
 from datetime import timedelta
+from string import Formatter
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
 from discord.ext import commands
 from discord import app_commands, Webhook, SelectOption, ui, Embed, Color, Interaction, ButtonStyle, TextStyle, Member, User, VoiceChannel, TextChannel, Role
 from telethon import TelegramClient, events
@@ -27,12 +37,53 @@ PERSISTENT_LIST_DATA_FILE = "persistent_list_data.json"
 ACTIVE_BANS_FILE = "active_bans.json"
 REMINDER_MESSAGES_FILE = "reminder_messages.json"
 PERMISSIONS_FILE = "permissions.json"
+LIST_JOURNAL_FILE = "persistent_list_journal.ndjson"
+LIST_ARCHIVE_DIR = "list_archive"
+RESTART_INFO_FILE = "restart_info.json"
+INVITE_POOL_FILE = "invite_pool.json"
+SQLITE_DB_FILE = "bot_state.db"
+# Stores the bot writes itself. turf_config.json is edited by hand and is always read straight from disk.
+STATE_FILES = [GUILD_SETTINGS_FILE, TELEGRAM_CONFIG_FILE, PRESET_FILE, PERSISTENT_LIST_DATA_FILE,
+               ACTIVE_BANS_FILE, REMINDER_MESSAGES_FILE, PERMISSIONS_FILE, RESTART_INFO_FILE, INVITE_POOL_FILE]
+
+# ===== Storage =====
+STORAGE_BACKEND = "sqlite" # "json" keeps the original one-file-per-store layout
 
 # ===== System Constants =====
 MAX_MAIN_LIST_SLOTS = 15
 ROLE_LIST_IN_NAME = "Teilnehmer"
 ROLE_LIST_RESERVE_NAME = "Reserve"
+LIST_STATUS_ROLES = {"main": ROLE_LIST_IN_NAME, "reserve": ROLE_LIST_RESERVE_NAME}
+LIST_STATUS_ROLE_REASONS = {"main": "Joined main list", "reserve": "Joined reserve list"}
 AUTO_LIST_POST_DELAY = 3 # Seconds
+TELEGRAM_FILTER_REFRESH_INTERVAL = 6 * 3600 # Seconds between re-resolving the filtered Telegram username
+TELEGRAM_FILTER_RETRY_INTERVAL = 60 # Seconds before retrying a username that could not be resolved yet
+DISCORD_MESSAGE_LIMIT = 2000
+WEBHOOK_QUEUE_MAX_SIZE = 100 # Posts waiting per webhook before the overflow policy applies
+WEBHOOK_QUEUE_OVERFLOW = "drop_oldest" # "drop_oldest" keeps the latest reports, "drop_newest" rejects new ones
+WEBHOOK_MERGE_WINDOW = 2.0 # Seconds; queued messages this close to the first one waiting may share its post
+WEBHOOK_SEND_RETRIES = 4 # Extra attempts for a post that was rate limited or hit a server/network error
+WEBHOOK_RETRY_BACKOFF = 1.0 # Seconds before the first retry when Discord gives no Retry-After; doubles per attempt
+WEBHOOK_DRAIN_TIMEOUT = 5 # Seconds shutdown waits for queued posts
+LIST_RENDER_INTERVAL = 1.5 # Seconds, minimum gap between two edits of the same list message
+LIST_RENDER_RETRIES = 3 # Extra attempts for a list edit that failed, one interval apart
+LIST_RENDER_STATS_INTERVAL = 600 # Seconds between two logs of the render counters
+LOCALE_RELOAD_INTERVAL = 5 # Seconds between checks of the locale file for changes
+VOICE_MOVE_CONCURRENCY = 5 # Parallel voice moves per guild for /list_move_all
+VOICE_MOVE_RETRIES = 3 # Extra attempts for a move that was rate limited
+VOICE_MOVE_BACKOFF = 1.0 # Seconds before the first retry when Discord gives no Retry-After; doubles per attempt
+LIST_HISTORY_PAGE_SIZE = 10 # Archived lists per /list_history page
+MAX_OPEN_LISTS_PER_GUILD = 5 # Automatic lists retire the oldest open one beyond this
+LIST_STARTUP_CONCURRENCY = 5 # Legacy list messages upgraded in parallel on startup
+BAN_EXPIRY_WORKERS = 4 # Concurrent unban handlers when many bans expire together
+BAN_DM_REFRESH_MODE = "transitions" # "periodic" also re-edits every countdown DM each interval
+BAN_DM_REFRESH_INTERVAL = 900 # Seconds between countdown DM refresh sweeps
+BAN_DM_REFRESH_EDITS_PER_SECOND = 2
+INVITE_POOL_SIZE = 3 # Pre-created single-use invites kept per guild
+INVITE_MAX_AGE = 86400 # Seconds
+INVITE_POOL_MIN_REMAINING = 3600 # Pooled invites closer than this to expiring are dropped
+SAVE_COALESCE_DELAY = 2 # Seconds, writes to the same file inside this window are merged
+LIST_JOURNAL_COMPACT_BYTES = 256 * 1024 # Journal size that triggers folding it into the list snapshot
 
 # ===== MyBot Class for Better Structure =====
 class MyBot(commands.Bot):
@@ -41,14 +92,68 @@ class MyBot(commands.Bot):
         self.moving_tasks: dict[tuple[int, int], asyncio.Task] = {}
         self.reminder_messages: dict[int, str] = {}
         self.telegram_clients: dict[str, TelegramClient] = {}
+        self.telegram_filter_tasks: dict[str, asyncio.Task] = {}
+        self.telegram_stats: dict[str, TelegramForwardStats] = {}
+        self.http_session: aiohttp.ClientSession | None = None
+        self._webhooks: dict[str, Webhook] = {}
+        self._webhook_queues: dict[str, WebhookDispatchQueue] = {}
+
+    def get_webhook(self, webhook_url: str) -> Webhook:
+        """One Webhook per URL, all sharing a single keep-alive HTTP session."""
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession()
+            self._webhooks.clear()
+        if (webhook := self._webhooks.get(webhook_url)) is None:
+            webhook = self._webhooks[webhook_url] = Webhook.from_url(webhook_url, session=self.http_session)
+        return webhook
+
+    def get_webhook_queue(self, webhook_url: str) -> "WebhookDispatchQueue":
+        if (queue := self._webhook_queues.get(webhook_url)) is None:
+            queue = self._webhook_queues[webhook_url] = WebhookDispatchQueue(self, webhook_url)
+        return queue
+
+    def forget_webhook(self, webhook_url: str):
+        self._webhooks.pop(webhook_url, None)
+        if queue := self._webhook_queues.pop(webhook_url, None):
+            queue.close()
+
+    async def drain_webhook_queues(self, timeout: float = WEBHOOK_DRAIN_TIMEOUT):
+        await asyncio.gather(*(queue.drain(timeout) for queue in self._webhook_queues.values()))
+
+    async def close(self):
+        await persistence.close()
+        await self.drain_webhook_queues()
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        await super().close()
 
 # ===== Localization Manager =====
+class LocaleTemplate:
+    """A locale string that needs formatting. Strings without placeholders are stored as plain str instead."""
+    __slots__ = ("text", "fields")
+
+    def __init__(self, text: str, fields: frozenset[str]):
+        self.text = text
+        self.fields = fields
+
+def compile_locale_string(text: str) -> str | LocaleTemplate:
+    fields = frozenset(re.split(r"[.\[]", name, maxsplit=1)[0] for _, name, _, _ in Formatter().parse(text) if name is not None)
+    # No placeholders: resolve "{{"/"}}" escapes once and hand out the interned constant from now on
+    return LocaleTemplate(text, fields) if fields else sys.intern(text.format())
+
 class LocalizationManager:
     def __init__(self, locale_file: str, settings_file: str):
         self.locale_file = locale_file
         self.settings_file = settings_file
         self._locales = self._load_json(self.locale_file)
-        self._settings = self._load_json(self.settings_file)
+        self._settings = storage.load(self.settings_file)
+        self._defaults: dict[str, str] = {}
+        self._catalogs: dict[str, dict[str, str | LocaleTemplate]] = {}
+        self._guild_catalogs: dict[int, dict[str, str | LocaleTemplate]] = {}
+        self._watch_task: asyncio.Task | None = None
+        self.generation = 0 # Bumped on every catalog swap so callers can drop strings they derived from the old one
+        # Compiled on the first lookup, so the defaults registered at import time all go into a single build
+        self._stale = True
         print(f"[Localization] Loaded {len(self._locales.get('en', {}))} English strings.")
         print(f"[Localization] Loaded {len(self._settings)} guild language settings.")
 
@@ -61,12 +166,88 @@ class LocalizationManager:
             print(f"[ERROR] Failed to load JSON from {file_path}: {e}")
         return {}
 
-    def _save_settings(self):
+    @staticmethod
+    def build_catalogs(locales: dict[str, dict[str, str]], defaults: dict[str, str]) -> tuple[dict, list[str]]:
+        """Compiles every language into templates with English merged in as fallback. Pure, so it can run in an executor."""
+        report = []
+        compiled_langs = {}
+        for lang in locales.keys() | {"en"}:
+            compiled = {}
+            # Built-in strings are only defaults, the locale file always wins
+            for key, text in {**defaults, **locales.get(lang, {})}.items():
+                try:
+                    compiled[key] = compile_locale_string(text)
+                except (ValueError, IndexError, KeyError, AttributeError) as e:
+                    report.append(f"{lang}.{key}: malformed template ({e})")
+                    compiled[key] = f"[Formatting error for key: '{key}'. {e}]"
+            compiled_langs[lang] = compiled
+        english = compiled_langs["en"]
+        catalogs = {"en": english}
+        for lang, compiled in compiled_langs.items():
+            if lang == "en": continue
+            if missing := english.keys() - compiled.keys():
+                report.append(f"{lang}: {len(missing)} keys missing, falling back to English: {', '.join(sorted(missing))}")
+            for key, template in compiled.items():
+                expected = getattr(english.get(key), "fields", frozenset())
+                if extra := getattr(template, "fields", frozenset()) - expected:
+                    report.append(f"{lang}.{key}: placeholders {sorted(extra)} are never passed by callers")
+            catalogs[lang] = {**english, **compiled}
+        return catalogs, report
+
+    def _install_catalogs(self, locales: dict, catalogs: dict, report: list[str]):
+        # Plain attribute swaps: a get_string running concurrently sees either the old or the new catalog, never a mix
+        self._locales = locales
+        self._catalogs = catalogs
+        self._guild_catalogs = {}
+        self._stale = False
+        self.generation += 1
+        for line in report:
+            print(f"[Localization WARNING] {line}")
+
+    def compile_catalogs(self):
+        self._install_catalogs(self._locales, *self.build_catalogs(self._locales, self._defaults))
+
+    def register_defaults(self, strings: dict[str, str]):
+        """Adds built-in strings for every language, underneath whatever the locale file defines.
+        The catalogs are rebuilt on the next lookup."""
+        self._defaults.update(strings)
+        self._stale = True
+        self._guild_catalogs = {}
+
+    def start_watching(self):
+        # on_ready fires again after every reconnect, but one watcher is enough
+        if not self._watch_task or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self.watch_locale_file())
+
+    async def watch_locale_file(self, interval: float = LOCALE_RELOAD_INTERVAL):
+        """Polls the locale file and hot-swaps a freshly compiled catalog whenever it changes."""
+        loop = asyncio.get_running_loop()
+        last_stat = self._locale_file_stat()
+        while True:
+            await asyncio.sleep(interval)
+            stat = self._locale_file_stat()
+            if stat == last_stat: continue
+            last_stat = stat
+            try:
+                with open(self.locale_file, 'r', encoding='utf-8') as f:
+                    locales = await loop.run_in_executor(None, json.load, f)
+                catalogs, report = await loop.run_in_executor(None, self.build_catalogs, locales, dict(self._defaults))
+            except (json.JSONDecodeError, IOError) as e:
+                # Most likely caught mid-save; keep serving the current catalog and retry on the next change
+                print(f"[Localization] Not reloading {self.locale_file}: {e}")
+                continue
+            self._install_catalogs(locales, catalogs, report)
+            print(f"[Localization] Reloaded {self.locale_file} ({len(catalogs.get('en', {}))} English strings).")
+
+    def _locale_file_stat(self) -> tuple[int, int] | None:
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=4)
-        except IOError as e:
-            print(f"[ERROR] Failed to save settings to {self.settings_file}: {e}")
+            stat = os.stat(self.locale_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _save_settings(self, guild_id_str: str | None = None):
+        persistence.schedule_save(self.settings_file, self._settings, key=guild_id_str)
 
     def get_language(self, guild_id: int | None) -> str:
         if guild_id is None:
@@ -81,21 +262,31 @@ class LocalizationManager:
         if guild_id_str not in self._settings:
             self._settings[guild_id_str] = {}
         self._settings[guild_id_str]["language"] = lang
-        self._save_settings()
+        self._guild_catalogs.pop(guild_id, None)
+        self._save_settings(guild_id_str)
+
+    def _catalog_for(self, guild_id: int | None) -> dict[str, str | LocaleTemplate]:
+        catalog = self._guild_catalogs.get(guild_id)
+        if catalog is None:
+            if self._stale: self.compile_catalogs()
+            catalog = self._catalogs.get(self.get_language(guild_id)) or self._catalogs.get("en", {})
+            self._guild_catalogs[guild_id] = catalog
+        return catalog
 
     def get_string(self, guild_id: int | None, key: str, **kwargs) -> str:
-        lang = self.get_language(guild_id)
-        string = self._locales.get(lang, {}).get(key)
+        template = self._catalog_for(guild_id).get(key)
         
         # --- DIAGNOSTIC CHANGE ---
         # If a key is missing from the file, the bot will now report the exact key name.
-        if string is None:
-            string = self._locales.get("en", {}).get(key, f"[Translation missing for key: '{key}']")
+        if template is None:
+            return f"[Translation missing for key: '{key}']"
+        if template.__class__ is str:
+            return template
         
         try:
-            return string.format(**kwargs)
+            return template.text.format(**kwargs)
         except KeyError as e:
-            print(f"[Localization ERROR] Missing format argument {e} for key '{key}' in language '{lang}'")
+            print(f"[Localization ERROR] Missing format argument {e} for key '{key}' in language '{self.get_language(guild_id)}'")
             # Also improve the formatting error message
             return f"[Formatting error for key: '{key}'. Expected argument: {e}]"
 
@@ -108,9 +299,6 @@ intents.voice_states = True
 intents.dm_messages = True
 bot = MyBot(command_prefix="!", intents=intents)
 
-# ===== Initialize Managers =====
-localizer = LocalizationManager(LOCALE_FILE, GUILD_SETTINGS_FILE)
-
 # ===== Load/Save Helper Functions =====
 def load_json_file(filepath, is_dict=True):
     if os.path.exists(filepath):
@@ -121,19 +309,229 @@ def load_json_file(filepath, is_dict=True):
             return {} if is_dict else []
     return {} if is_dict else []
 
-def save_json_file(data, filepath):
-    try:
-        with open(filepath, "w", encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"[ERROR] Failed to save to {filepath}: {e}")
+def _json_default(obj):
+    # In-memory structures such as OrderedMembership serialize back to their plain JSON shape
+    if hasattr(obj, "to_json"): return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _write_text_atomic(text: str, filepath):
+    # Write into a temp file next to the target and swap it in, so a crash never leaves a half-written file
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+def _write_json_atomic(data, filepath):
+    _write_text_atomic(json.dumps(data, indent=4, default=_json_default), filepath)
+
+def _encode_key(key) -> str:
+    # Tuple keys (e.g. ban keys) use the same "a,b" form the JSON files always had
+    return ",".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+# ===== Storage Backends =====
+# A store is identified by its legacy JSON file name and always maps string keys to JSON values.
+class JsonStorageBackend:
+    def load(self, store: str) -> dict:
+        return load_json_file(store)
+
+    def serialize(self, store: str, data: dict, keys: set | None = None) -> str:
+        # Flat files can only be rewritten whole, so the dirty keys are ignored
+        return json.dumps({_encode_key(k): v for k, v in data.items()}, indent=4, default=_json_default)
+
+    def write_serialized(self, store: str, payload: str):
+        _write_text_atomic(payload, store)
+
+    def write(self, store: str, data: dict, keys: set | None = None):
+        self.write_serialized(store, self.serialize(store, data, keys))
+
+    def clear(self, store: str):
+        if os.path.exists(store):
+            os.remove(store)
+
+    def export_legacy_files(self):
+        pass # The JSON files already are the live state
+
+class SqliteStorageBackend:
+    def __init__(self, db_file: str, legacy_files: list[str]):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS records (store TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (store, key))")
+        # mtime of each JSON file as last imported or exported; any other mtime means the file was edited or replaced
+        self._conn.execute("CREATE TABLE IF NOT EXISTS json_sync (store TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL)")
+        # Stores written since their last import or export, i.e. the ones whose JSON file is behind the database
+        self._conn.execute("CREATE TABLE IF NOT EXISTS json_stale (store TEXT PRIMARY KEY)")
+        self._conn.commit()
+        self.legacy_files = legacy_files
+        for store in legacy_files:
+            self._import_json(store)
+
+    def _synced_mtime(self, store: str) -> int | None:
+        row = self._conn.execute("SELECT mtime_ns FROM json_sync WHERE store = ?", (store,)).fetchone()
+        return row[0] if row else None
+
+    def _import_json(self, store: str):
+        # The JSON files stay in place, so switching STORAGE_BACKEND back to "json" picks up where SQLite left off
+        if not os.path.exists(store): return
+        mtime_ns = os.stat(store).st_mtime_ns
+        with self._lock:
+            if self._synced_mtime(store) == mtime_ns: return
+            data = load_json_file(store)
+            with self._conn:
+                self._conn.execute("DELETE FROM records WHERE store = ?", (store,))
+                self._conn.executemany("INSERT INTO records (store, key, value) VALUES (?, ?, ?)",
+                                       [(store, str(k), json.dumps(v)) for k, v in data.items()])
+                self._conn.execute("INSERT OR REPLACE INTO json_sync (store, mtime_ns) VALUES (?, ?)", (store, mtime_ns))
+                self._conn.execute("DELETE FROM json_stale WHERE store = ?", (store,))
+        print(f"[Storage] Imported {len(data)} records from {store} into {self.db_file}.")
+
+    def export_legacy_files(self):
+        """Writes the stores changed since their last sync back to their JSON files on shutdown. A file edited since
+        the last sync is left alone so the edit is imported on the next start instead of being overwritten."""
+        with self._lock:
+            stale = {row[0] for row in self._conn.execute("SELECT store FROM json_stale")}
+        for store in self.legacy_files:
+            if store not in stale: continue
+            with self._lock:
+                synced = self._synced_mtime(store)
+                if os.path.exists(store) and os.stat(store).st_mtime_ns != synced:
+                    print(f"[Storage] {store} changed on disk, not exporting over it.")
+                    continue
+                data = self.load_unlocked(store)
+                if not data:
+                    if os.path.exists(store): os.remove(store)
+                    with self._conn:
+                        self._conn.execute("DELETE FROM json_sync WHERE store = ?", (store,))
+                        self._conn.execute("DELETE FROM json_stale WHERE store = ?", (store,))
+                    continue
+                try:
+                    _write_json_atomic(data, store)
+                except Exception as e:
+                    print(f"[ERROR] Failed to export {store}: {e}")
+                    continue
+                with self._conn:
+                    self._conn.execute("INSERT OR REPLACE INTO json_sync (store, mtime_ns) VALUES (?, ?)", (store, os.stat(store).st_mtime_ns))
+                    self._conn.execute("DELETE FROM json_stale WHERE store = ?", (store,))
+
+    def load(self, store: str) -> dict:
+        with self._lock:
+            return self.load_unlocked(store)
+
+    def load_unlocked(self, store: str) -> dict:
+        rows = self._conn.execute("SELECT key, value FROM records WHERE store = ?", (store,)).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def serialize(self, store: str, data: dict, keys: set | None = None) -> tuple[bool, list, list]:
+        """Returns (rewrite the whole store, rows to upsert, rows to delete)."""
+        # A dirty key that is no longer in the dict was popped, so its row gets deleted. None is stored as null,
+        # like the JSON backend does.
+        records = data.items() if keys is None else [(k, data[k]) for k in keys if k in data]
+        rows = [(store, _encode_key(k), json.dumps(v, default=_json_default)) for k, v in records]
+        deleted = [] if keys is None else [(store, _encode_key(k)) for k in keys if k not in data]
+        return keys is None, rows, deleted
+
+    def write_serialized(self, store: str, payload: tuple[bool, list, list]):
+        rewrite, rows, deleted = payload
+        with self._lock, self._conn:
+            if rewrite:
+                self._conn.execute("DELETE FROM records WHERE store = ?", (store,))
+            self._conn.executemany("DELETE FROM records WHERE store = ? AND key = ?", deleted)
+            self._conn.executemany("INSERT OR REPLACE INTO records (store, key, value) VALUES (?, ?, ?)", rows)
+            self._conn.execute("INSERT OR IGNORE INTO json_stale (store) VALUES (?)", (store,))
+
+    def write(self, store: str, data: dict, keys: set | None = None):
+        self.write_serialized(store, self.serialize(store, data, keys))
+
+    def clear(self, store: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM records WHERE store = ?", (store,))
+            self._conn.execute("INSERT OR IGNORE INTO json_stale (store) VALUES (?)", (store,))
+
+def create_storage_backend(name: str) -> JsonStorageBackend | SqliteStorageBackend:
+    if name == "sqlite":
+        return SqliteStorageBackend(SQLITE_DB_FILE, STATE_FILES)
+    if name == "json":
+        return JsonStorageBackend()
+    raise ValueError(f"Unknown storage backend '{name}'.")
+
+storage = create_storage_backend(STORAGE_BACKEND)
+print(f"[Storage] Using {type(storage).__name__}.")
+
+# ===== Write-Behind Persistence =====
+class PersistenceManager:
+    def __init__(self, backend: JsonStorageBackend | SqliteStorageBackend, coalesce_delay: float):
+        self.backend = backend
+        self.coalesce_delay = coalesce_delay
+        # store -> (live dict, dirty keys or None when the whole store must be rewritten)
+        self._dirty: dict[str, tuple[dict, set | None]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    def _mark(self, store: str, data: dict, keys: set | None):
+        if store in self._dirty:
+            pending_keys = self._dirty[store][1]
+            keys = None if keys is None or pending_keys is None else pending_keys | keys
+        self._dirty[store] = (data, keys)
+
+    def schedule_save(self, store: str, data: dict, key: Any = None):
+        """Marks a store dirty. `data` is the live dict; the flush serializes it on the loop and writes it off the loop.
+        Pass `key` when only that record changed so row-based backends write a single row."""
+        self._mark(store, data, None if key is None else {key})
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop (import time): nothing would ever flush, so write through
+            _, keys = self._dirty.pop(store)
+            self.backend.write(store, data, keys)
+            return
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.coalesce_delay)
+        await self.flush()
+
+    async def flush(self):
+        """Writes every dirty store now. Called by the coalescing timer and forced on shutdown/restart."""
+        async with self._flush_lock:
+            loop = asyncio.get_running_loop()
+            for _ in range(3):
+                if not self._dirty: break
+                pending, self._dirty = self._dirty, {}
+                for store, (data, keys) in pending.items():
+                    try:
+                        # Serialized on the loop, so handlers mutating the live dict cannot race the executor thread
+                        payload = self.backend.serialize(store, data, keys)
+                        await loop.run_in_executor(None, self.backend.write_serialized, store, payload)
+                    except Exception as e:
+                        print(f"[ERROR] Failed to save {store}: {e}")
+                        self._mark(store, data, keys)
+            if self._dirty:
+                self._flush_task = loop.create_task(self._delayed_flush())
+
+    def is_dirty(self, store: str) -> bool:
+        return store in self._dirty
+
+    async def close(self):
+        """Final flush before shutdown/restart, then lets the backend mirror its state to the JSON files."""
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(None, self.backend.export_legacy_files)
+
+persistence = PersistenceManager(storage, SAVE_COALESCE_DELAY)
+
+# ===== Initialize Managers =====
+localizer = LocalizationManager(LOCALE_FILE, GUILD_SETTINGS_FILE)
 
 # ===== Load initial configurations =====
-user_configs = load_json_file(TELEGRAM_CONFIG_FILE)
+user_configs = storage.load(TELEGRAM_CONFIG_FILE)
 turf_config = load_json_file(TURF_CONFIG_FILE)
-turf_presets = load_json_file(PRESET_FILE)
+turf_presets = storage.load(PRESET_FILE)
 # FIX: Load reminder messages with string keys
-bot.reminder_messages = load_json_file(REMINDER_MESSAGES_FILE)
+bot.reminder_messages = storage.load(REMINDER_MESSAGES_FILE)
 
 DEFAULT_MESSAGE_PREFIX = "\u2728 Incoming turf report:"
 DEFAULT_PRESET = "**Attacker:** {attacker}\n**Begin:** {begin}\n**Zonename:** {zonename}\n**Zonenumber:** {zonenumber}"
@@ -154,6 +552,107 @@ def parse_duration(duration_str: str) -> timedelta | None:
         elif unit_lower.startswith('w'): total_seconds += value_int * 604800
     return timedelta(seconds=total_seconds) if total_seconds > 0 else None
 
+# ===== Invite Pool =====
+class InvitePool:
+    """Keeps a few pre-created single-use invites per guild so kick/unban flows hand one out
+    without waiting on create_invite, and a burst of expiring bans does not hit the invite route.
+    The pool is persisted, so the 30 minute restarts reuse it instead of creating a fresh batch each time."""
+    def __init__(self, bot_instance: MyBot, pool_size: int, max_age: int):
+        self.bot = bot_instance
+        self.pool_size = pool_size
+        self.max_age = max_age
+        self._channels: dict[int, int] = {}
+        # guild_id -> {"channel_id": ..., "invites": [[url, code, expires_at], ...]}
+        self._pools: dict[int, dict] = {}
+        self._refills: dict[int, asyncio.Task] = {}
+        self.load()
+
+    def load(self):
+        stored = storage.load(INVITE_POOL_FILE)
+        min_expiry = time.time() + INVITE_POOL_MIN_REMAINING
+        pruned = False
+        for guild_id_str, pool in stored.items():
+            invites = [entry for entry in pool["invites"] if entry[2] > min_expiry]
+            pruned |= len(invites) != len(pool["invites"])
+            if invites:
+                self._pools[int(guild_id_str)] = {"channel_id": pool["channel_id"], "invites": invites}
+                self._channels[int(guild_id_str)] = pool["channel_id"]
+        if pruned:
+            persistence.schedule_save(INVITE_POOL_FILE, self._pools)
+
+    def _save(self, guild_id: int):
+        persistence.schedule_save(INVITE_POOL_FILE, self._pools, guild_id)
+
+    def _invite_channel(self, guild: discord.Guild) -> TextChannel | None:
+        if channel_id := self._channels.get(guild.id):
+            if channel := guild.get_channel(channel_id):
+                return channel
+            # Deleted while the bot was offline; its pooled invites went with it
+            self.invalidate_channel(guild.id)
+        channel = guild.system_channel or next((c for c in guild.text_channels if c.permissions_for(guild.me).create_instant_invite), None)
+        if channel: self._channels[guild.id] = channel.id
+        return channel
+
+    def invalidate_channel(self, guild_id: int, channel_id: int | None = None):
+        if channel_id is None or self._channels.get(guild_id) == channel_id:
+            self._channels.pop(guild_id, None)
+            if self._pools.pop(guild_id, None): # Pooled invites pointed at that channel
+                self._save(guild_id)
+
+    def discard(self, guild_id: int, code: str):
+        if pool := self._pools.get(guild_id):
+            pool["invites"] = [entry for entry in pool["invites"] if entry[1] != code]
+            self._save(guild_id)
+
+    async def _create(self, guild: discord.Guild, reason: str) -> discord.Invite | None:
+        if not (channel := self._invite_channel(guild)): return None
+        try:
+            return await channel.create_invite(max_age=self.max_age, max_uses=1, unique=True, reason=reason)
+        except (discord.Forbidden, discord.NotFound):
+            # Channel deleted or permissions changed: resolve a different one next time
+            self.invalidate_channel(guild.id)
+            raise
+
+    def _pool_size(self, guild_id: int) -> int:
+        return len(pool["invites"]) if (pool := self._pools.get(guild_id)) else 0
+
+    def refill(self, guild: discord.Guild):
+        if self._pool_size(guild.id) >= self.pool_size: return
+        if (task := self._refills.get(guild.id)) and not task.done(): return
+        self._refills[guild.id] = asyncio.create_task(self._refill(guild))
+
+    async def _refill(self, guild: discord.Guild):
+        while self._pool_size(guild.id) < self.pool_size:
+            try:
+                invite = await self._create(guild, "Pre-created single-use rejoin invite")
+            except Exception as e:
+                print(f"[InvitePool] Could not refill invites for guild {guild.id}: {e}")
+                return
+            if not invite: return
+            pool = self._pools.setdefault(guild.id, {"channel_id": invite.channel.id, "invites": []})
+            pool["invites"].append([invite.url, invite.code, time.time() + self.max_age])
+            self._save(guild.id)
+
+    async def acquire(self, guild: discord.Guild, reason: str) -> str | None:
+        """Returns a single-use invite URL, from the pool when possible, else freshly created. None if neither works."""
+        # Resolving the channel first drops a pool whose channel disappeared while the bot was offline
+        self._invite_channel(guild)
+        pool = self._pools.get(guild.id)
+        min_expiry = time.time() + INVITE_POOL_MIN_REMAINING
+        while pool and pool["invites"]:
+            url, _, expires_at = pool["invites"].pop(0)
+            self._save(guild.id)
+            if expires_at > min_expiry:
+                self.refill(guild)
+                return url
+        try:
+            invite = await self._create(guild, reason)
+        except Exception as e:
+            print(f"[InvitePool] Could not create invite for guild {guild.id}: {e}")
+            invite = None
+        self.refill(guild)
+        return invite.url if invite else None
+
 # ===== Ban Management System =====
 class BanDMView(ui.View):
     def __init__(self, ban_manager_instance):
@@ -164,19 +663,15 @@ class BanDMView(ui.View):
     async def refresh_button(self, interaction: Interaction, button: ui.Button):
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
-        found_guild_id = None
-        for g_id, u_id in self.manager.active_bans.keys():
-            if u_id == user_id:
-                found_guild_id = g_id
-                break
-
-        if found_guild_id:
-            await self.manager.update_ban_dm(found_guild_id, user_id)
-            ban_info = self.manager.active_bans.get((found_guild_id, user_id))
-            lang_context_id = found_guild_id
-            if ban_info and ban_info.get("dm_message_id"):
-                unban_time = datetime.datetime.fromtimestamp(ban_info["unban_timestamp"], tz=datetime.timezone.utc)
-                if unban_time > datetime.datetime.now(datetime.timezone.utc):
+        guild_ids = list(self.manager.bans_by_user.get(user_id, ()))
+
+        if guild_ids:
+            # A user can be banned from several guilds; refresh every one of their countdowns
+            await asyncio.gather(*(self.manager.update_ban_dm(g_id, user_id) for g_id in guild_ids))
+            ban_infos = [info for g_id in guild_ids if (info := self.manager.active_bans.get((g_id, user_id))) and info.get("dm_message_id")]
+            lang_context_id = guild_ids[0]
+            if ban_infos:
+                if any(info["unban_timestamp"] > time.time() for info in ban_infos):
                     await interaction.followup.send(localizer.get_string(lang_context_id, "ban_dm_refresh_success"), ephemeral=True)
                 else:
                     await interaction.followup.send(localizer.get_string(lang_context_id, "ban_dm_refresh_expired"), ephemeral=True)
@@ -185,23 +680,104 @@ class BanDMView(ui.View):
         else:
             await interaction.followup.send(localizer.get_string(None, "ban_dm_refresh_fail_noban"), ephemeral=True)
 
+class BanScheduler:
+    """One timer heap for every timed ban. A single runner sleeps until the nearest unban deadline
+    and hands due bans to a small pool of workers, instead of keeping a sleeping task per ban."""
+    def __init__(self, on_expire: Callable[[int, int], Awaitable[None]], workers: int):
+        self.on_expire = on_expire
+        self.workers = workers
+        self._heap: list[tuple[float, int, tuple[int, int]]] = []
+        # Only the entry recorded here is live; anything else still on the heap is a cancelled leftover
+        self._deadlines: dict[tuple[int, int], tuple[float, int]] = {}
+        self._tokens = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._queue: asyncio.Queue[tuple[int, int]] = asyncio.Queue(maxsize=workers * 4)
+        self._tasks: list[asyncio.Task] = []
+        self.wakeups = 0
+
+    def schedule(self, ban_key: tuple[int, int], deadline: float):
+        token = next(self._tokens)
+        self._deadlines[ban_key] = (deadline, token)
+        heapq.heappush(self._heap, (deadline, token, ban_key))
+        if self._heap[0][1] == token:
+            self._wakeup.set() # New earliest deadline, the runner has to shorten its sleep
+
+    def cancel(self, ban_key: tuple[int, int]):
+        self._deadlines.pop(ban_key, None)
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, token, key) for key, (deadline, token) in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def start(self):
+        if self._tasks and not any(t.done() for t in self._tasks): return
+        for task in self._tasks: task.cancel()
+        self._tasks = [asyncio.create_task(self._run())] + [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            while self._heap:
+                deadline, token, ban_key = self._heap[0]
+                if self._deadlines.get(ban_key) != (deadline, token):
+                    heapq.heappop(self._heap)
+                    continue
+                if deadline > now: break
+                heapq.heappop(self._heap)
+                del self._deadlines[ban_key]
+                await self._queue.put(ban_key)
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeups += 1
+
+    async def _worker(self):
+        while True:
+            guild_id, user_id = await self._queue.get()
+            try:
+                await self.on_expire(guild_id, user_id)
+            except Exception as e:
+                print(f"[BanScheduler] Error expiring ban for {user_id} in {guild_id}: {e}")
+            finally:
+                self._queue.task_done()
+
 class BanManager:
     def __init__(self, bot_instance: MyBot, localizer_instance: LocalizationManager):
         self.bot = bot_instance
         self.localizer = localizer_instance
         self.active_bans = {}
+        # Secondary index user_id -> guild_ids, kept in step with every insert into and pop from active_bans
+        self.bans_by_user: dict[int, set[int]] = {}
+        self.scheduler = BanScheduler(self._expire_ban, BAN_EXPIRY_WORKERS)
+        self._refresh_task: asyncio.Task | None = None
         self.load_bans()
 
     def load_bans(self):
-        raw_data = load_json_file(ACTIVE_BANS_FILE)
+        raw_data = storage.load(ACTIVE_BANS_FILE)
         if raw_data:
             self.active_bans = {(int(k.split(',')[0]), int(k.split(',')[1])): v for k, v in raw_data.items()}
             for ban_data_val in self.active_bans.values():
                 if "status" not in ban_data_val: ban_data_val["status"] = "active"
+        self.bans_by_user = {}
+        for guild_id, user_id in self.active_bans:
+            self.bans_by_user.setdefault(user_id, set()).add(guild_id)
         print(f"[BanManager] {len(self.active_bans)} active bans loaded.")
 
-    def save_bans(self):
-        save_json_file({f"{k[0]},{k[1]}": v for k, v in self.active_bans.items()}, ACTIVE_BANS_FILE)
+    def save_bans(self, ban_key: tuple[int, int] | None = None):
+        persistence.schedule_save(ACTIVE_BANS_FILE, self.active_bans, key=ban_key)
+
+    def _add_ban(self, ban_key: tuple[int, int], ban_data: dict):
+        self.active_bans[ban_key] = ban_data
+        self.bans_by_user.setdefault(ban_key[1], set()).add(ban_key[0])
+
+    def pop_ban(self, ban_key: tuple[int, int]) -> dict | None:
+        ban_data = self.active_bans.pop(ban_key, None)
+        if (guild_ids := self.bans_by_user.get(ban_key[1])) is not None:
+            guild_ids.discard(ban_key[0])
+            if not guild_ids: del self.bans_by_user[ban_key[1]]
+        return ban_data
 
     def _generate_ban_embed(self, guild_id: int, reason: str, unban_timestamp: float, status: str = "active") -> Embed:
         guild = self.bot.get_guild(guild_id)
@@ -231,97 +807,102 @@ class BanManager:
             except (discord.Forbidden, discord.HTTPException) as e:
                 print(f"Could not restore roles for {member.display_name} in {guild.name}: {e}")
 
+    async def _ban_dm_message(self, ban_key: tuple[int, int], ban_data: dict, user: User | None = None) -> discord.PartialMessage:
+        """Returns the countdown DM as a partial message, so editing it needs no fetches."""
+        if not ban_data.get("dm_channel_id"):
+            # Bans recorded before the DM channel was stored: resolve it once and remember it
+            user = user or await self.bot.fetch_user(ban_key[1])
+            channel = user.dm_channel or await user.create_dm()
+            ban_data["dm_channel_id"] = channel.id
+            if ban_key in self.active_bans: self.save_bans(ban_key)
+        channel = self.bot.get_partial_messageable(ban_data["dm_channel_id"], type=discord.ChannelType.private)
+        return channel.get_partial_message(ban_data["dm_message_id"])
+
     async def update_ban_dm(self, guild_id: int, user_id: int):
         ban_data = self.active_bans.get((guild_id, user_id))
         if not ban_data or not ban_data.get("dm_message_id"): return
         try:
             guild = self.bot.get_guild(guild_id)
             if not guild: return
-            user = await self.bot.fetch_user(user_id)
-            channel = await user.create_dm()
-            message = await channel.fetch_message(ban_data["dm_message_id"])
+            message = await self._ban_dm_message((guild_id, user_id), ban_data)
             embed = self._generate_ban_embed(guild_id, ban_data["reason"], ban_data["unban_timestamp"], ban_data.get("status"))
             await message.edit(embed=embed)
         except (discord.NotFound, discord.Forbidden):
             ban_data["dm_message_id"] = None
-            self.save_bans()
+            self.save_bans((guild_id, user_id))
         except Exception as e:
             print(f"[BanManager] Error updating ban DM for {user_id}: {e}")
 
-    async def _handle_ban_session(self, guild_id: int, user_id: int):
+    async def _expire_ban(self, guild_id: int, user_id: int):
         ban_key = (guild_id, user_id)
-        while ban_key in self.active_bans and self.active_bans[ban_key].get("status") == "active":
-            ban_data = self.active_bans[ban_key]
-            unban_time = datetime.datetime.fromtimestamp(ban_data["unban_timestamp"], tz=datetime.timezone.utc)
-            now = datetime.datetime.now(datetime.timezone.utc)
-            if now >= unban_time:
-                guild = self.bot.get_guild(guild_id)
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                except discord.NotFound:
-                    self.active_bans.pop(ban_key, None)
-                    self.save_bans()
-                    return
+        ban_data = self.active_bans.get(ban_key)
+        if not ban_data or ban_data.get("status") != "active": return
+        if time.time() < ban_data["unban_timestamp"]:
+            # Woken early (e.g. the system clock moved), put it back on the heap
+            self.scheduler.schedule(ban_key, ban_data["unban_timestamp"])
+            return
+        guild = self.bot.get_guild(guild_id)
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            self.pop_ban(ban_key)
+            self.save_bans(ban_key)
+            return
 
-                if not guild:
-                    self.active_bans.pop(ban_key, None)
-                    self.save_bans()
-                    return
+        if not guild:
+            self.pop_ban(ban_key)
+            self.save_bans(ban_key)
+            return
+        try:
+            await guild.unban(user, reason=self.localizer.get_string(guild.id, "ban_unban_reason_expired"))
+            invite_link = await invite_pool.acquire(guild, reason=f"Auto-invite for {user.name} after ban.")
+
+            if ban_data.get("dm_message_id"):
                 try:
-                    await guild.unban(user, reason=self.localizer.get_string(guild.id, "ban_unban_reason_expired"))
-                    invite_link = None
-                    try:
-                        target_channel = guild.system_channel or next((c for c in guild.text_channels if c.permissions_for(guild.me).create_instant_invite), None)
-                        if target_channel:
-                            invite = await target_channel.create_invite(max_age=86400, max_uses=1, reason=f"Auto-invite for {user.name} after ban.")
-                            invite_link = invite.url
-                    except Exception as e:
-                        print(f"Could not create invite for unbanned user {user.id}: {e}")
-                    
-                    if ban_data.get("dm_message_id"):
-                        try:
-                            dm_channel = await user.create_dm()
-                            message = await dm_channel.fetch_message(ban_data["dm_message_id"])
-                            status_for_embed = "unbanned_pending_roles" if ban_data.get("roles_to_restore") else "expired"
-                            expired_embed = self._generate_ban_embed(guild_id, ban_data["reason"], ban_data["unban_timestamp"], status_for_embed)
-                            expired_embed.add_field(name=self.localizer.get_string(guild.id, "ban_rejoin_link"),
-                                                    value=invite_link or self.localizer.get_string(guild.id, "ban_invite_failed"))
-                            await message.edit(embed=expired_embed, view=None)
-                        except (discord.NotFound, discord.Forbidden): pass
-
-                    member = guild.get_member(user_id)
-                    if member and ban_data.get("roles_to_restore"):
-                        await self._restore_roles(member, ban_data["roles_to_restore"])
-                        self.active_bans.pop(ban_key, None)
-                    elif ban_data.get("roles_to_restore"):
-                        ban_data["status"] = "unbanned_pending_roles"
-                    else:
-                        self.active_bans.pop(ban_key, None)
-                    self.save_bans()
-                    return
-                except discord.NotFound:
-                    member = guild.get_member(user_id)
-                    if member and ban_data.get("roles_to_restore"):
-                        await self._restore_roles(member, ban_data["roles_to_restore"])
-                    self.active_bans.pop(ban_key, None)
-                    self.save_bans()
-                    return
-                except discord.Forbidden:
-                    print(f"No permission to unban user {user_id} in guild {guild.id}")
-                    if ban_data.get("roles_to_restore"): ban_data["status"] = "unbanned_pending_roles"; self.save_bans()
-                    return
-                except Exception as e:
-                    print(f"Critical error unbanning user {user_id}: {e}")
-                    if ban_data.get("roles_to_restore"): ban_data["status"] = "unbanned_pending_roles"; self.save_bans()
-                    return
+                    message = await self._ban_dm_message(ban_key, ban_data, user)
+                    status_for_embed = "unbanned_pending_roles" if ban_data.get("roles_to_restore") else "expired"
+                    expired_embed = self._generate_ban_embed(guild_id, ban_data["reason"], ban_data["unban_timestamp"], status_for_embed)
+                    expired_embed.add_field(name=self.localizer.get_string(guild.id, "ban_rejoin_link"),
+                                            value=invite_link or self.localizer.get_string(guild.id, "ban_invite_failed"))
+                    await message.edit(embed=expired_embed, view=None)
+                except (discord.NotFound, discord.Forbidden): pass
+
+            member = guild.get_member(user_id)
+            if member and ban_data.get("roles_to_restore"):
+                await self._restore_roles(member, ban_data["roles_to_restore"])
+                self.pop_ban(ban_key)
+            elif ban_data.get("roles_to_restore"):
+                ban_data["status"] = "unbanned_pending_roles"
+            else:
+                self.pop_ban(ban_key)
+            self.save_bans(ban_key)
+            return
+        except discord.NotFound:
+            member = guild.get_member(user_id)
+            if member and ban_data.get("roles_to_restore"):
+                await self._restore_roles(member, ban_data["roles_to_restore"])
+            self.pop_ban(ban_key)
+            self.save_bans(ban_key)
+            return
+        except discord.Forbidden:
+            print(f"No permission to unban user {user_id} in guild {guild.id}")
+            if ban_data.get("roles_to_restore"): ban_data["status"] = "unbanned_pending_roles"; self.save_bans(ban_key)
+            return
+        except Exception as e:
+            print(f"Critical error unbanning user {user_id}: {e}")
+            if ban_data.get("roles_to_restore"): ban_data["status"] = "unbanned_pending_roles"; self.save_bans(ban_key)
+            return
 
-            seconds_remaining = (unban_time - now).total_seconds()
-            sleep_duration = max(1, min(seconds_remaining + 1, 900))
-            await asyncio.sleep(sleep_duration)
-            
-            if ban_key in self.active_bans and self.active_bans[ban_key].get("status") == "active":
-                if datetime.datetime.now(datetime.timezone.utc) < unban_time:
+    async def _countdown_refresh_loop(self):
+        # One sweep for all countdown DMs instead of every ban session waking up on its own.
+        # Edits are paced so a sweep over many bans never bursts into the rate limit.
+        while True:
+            await asyncio.sleep(BAN_DM_REFRESH_INTERVAL)
+            now = time.time()
+            for (guild_id, user_id), ban_data in list(self.active_bans.items()):
+                if ban_data.get("status") == "active" and ban_data["unban_timestamp"] > now and ban_data.get("dm_message_id"):
                     await self.update_ban_dm(guild_id, user_id)
+                    await asyncio.sleep(1 / BAN_DM_REFRESH_EDITS_PER_SECOND)
 
     async def start_ban(self, interaction: Interaction, member: Member, duration: timedelta, reason: str):
         guild = interaction.guild
@@ -349,11 +930,13 @@ class BanManager:
             if dm_message: await dm_message.delete()
             return
 
-        self.active_bans[(gid, member.id)] = {"unban_timestamp": unban_timestamp, "reason": reason,
-                                              "dm_message_id": dm_message.id if dm_message else None,
-                                              "banned_by": interaction.user.id, "roles_to_restore": roles_to_restore, "status": "active"}
-        self.save_bans()
-        asyncio.create_task(self._handle_ban_session(gid, member.id))
+        self._add_ban((gid, member.id), {"unban_timestamp": unban_timestamp, "reason": reason,
+                                         "dm_message_id": dm_message.id if dm_message else None,
+                                         "dm_channel_id": dm_message.channel.id if dm_message else None,
+                                         "banned_by": interaction.user.id, "roles_to_restore": roles_to_restore, "status": "active"})
+        self.save_bans((gid, member.id))
+        self.scheduler.schedule((gid, member.id), unban_timestamp)
+        invite_pool.refill(guild) # Warm for when this ban expires
         await interaction.response.send_message(self.localizer.get_string(gid, "ban_success", user=member.mention, duration=str(duration)), ephemeral=False)
 
     async def manual_unban(self, interaction: Interaction, user: User, reason: str):
@@ -361,8 +944,9 @@ class BanManager:
         if not guild: return
         gid = guild.id
         ban_key = (gid, user.id)
-        ban_data = self.active_bans.pop(ban_key, None)
-        if ban_data: self.save_bans()
+        ban_data = self.pop_ban(ban_key)
+        self.scheduler.cancel(ban_key)
+        if ban_data: self.save_bans(ban_key)
         
         try:
             await guild.unban(user, reason=f"Manually unbanned by {interaction.user.display_name}. Reason: {reason}")
@@ -377,14 +961,7 @@ class BanManager:
             await interaction.followup.send(self.localizer.get_string(gid, "unban_error", error=e), ephemeral=True)
             return
 
-        invite_link = None
-        target_invite_channel = guild.system_channel or next((c for c in guild.text_channels if c.permissions_for(guild.me).create_instant_invite), None)
-        if target_invite_channel:
-            try:
-                invite = await target_invite_channel.create_invite(max_age=86400, max_uses=1, reason=f"Invite after manual unban for {user.name}")
-                invite_link = invite.url
-            except Exception as e:
-                print(f"Could not create invite after manual unban for {user.id}: {e}")
+        invite_link = await invite_pool.acquire(guild, reason=f"Invite after manual unban for {user.name}")
         
         dm_action_feedback = ""
         original_dm_edited = False
@@ -394,8 +971,7 @@ class BanManager:
                                     description=self.localizer.get_string(gid, "unban_manual_dm_desc", admin=interaction.user.display_name, reason=reason),
                                     color=Color.green())
                 unban_embed.add_field(name=self.localizer.get_string(gid, "ban_rejoin_link"), value=invite_link or self.localizer.get_string(gid, "ban_invite_failed"))
-                dm_channel = await user.create_dm()
-                original_dm = await dm_channel.fetch_message(ban_data["dm_message_id"])
+                original_dm = await self._ban_dm_message(ban_key, ban_data, user)
                 await original_dm.edit(embed=unban_embed, view=None)
                 original_dm_edited = True
                 dm_action_feedback = f"\n{self.localizer.get_string(gid, 'unban_dm_edited')}"
@@ -414,10 +990,14 @@ class BanManager:
 
     async def initialize_sessions_on_ready(self):
         print("[BanManager] Initializing ban sessions...")
-        if not self.active_bans: return
-        for (guild_id, user_id), ban_data in list(self.active_bans.items()):
+        for ban_key, ban_data in self.active_bans.items():
             if ban_data.get("status") == "active":
-                asyncio.create_task(self._handle_ban_session(guild_id, user_id))
+                self.scheduler.schedule(ban_key, ban_data["unban_timestamp"])
+                if guild := self.bot.get_guild(ban_key[0]): invite_pool.refill(guild)
+        self.scheduler.start()
+        # The embed's <t:...:R> timestamp already counts down on the client, so periodic edits are optional
+        if BAN_DM_REFRESH_MODE == "periodic" and (not self._refresh_task or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._countdown_refresh_loop())
         print("[BanManager] Ban sessions initialized.")
 
 class UnbanSelectView(ui.View):
@@ -430,9 +1010,13 @@ class UnbanSelectView(ui.View):
         self.original_interaction = original_interaction
         gid = original_interaction.guild_id
         
-        options = [SelectOption(label=f"{be.user.name}#{be.user.discriminator}"[:100], value=str(be.user.id),
-                                description=(f"{self.ban_manager.localizer.get_string(gid, 'reason')}: {be.reason}"[:90] + "...") if be.reason else localizer.get_string(gid, 'no_reason_provided'))
-                   for be in banned_entries]
+        options = []
+        for be in banned_entries:
+            # Timed bans issued by the bot carry the plain reason, without the "Banned by ..." prefix Discord stores
+            timed_ban = self.ban_manager.active_bans.get((gid, be.user.id)) if gid in self.ban_manager.bans_by_user.get(be.user.id, ()) else None
+            reason_text = timed_ban["reason"] if timed_ban else be.reason
+            options.append(SelectOption(label=f"{be.user.name}#{be.user.discriminator}"[:100], value=str(be.user.id),
+                                        description=(f"{self.ban_manager.localizer.get_string(gid, 'reason')}: {reason_text}"[:90] + "...") if reason_text else localizer.get_string(gid, 'no_reason_provided')))
         
         if not options:
             options.append(SelectOption(label=localizer.get_string(gid, "unban_no_users_found"), value="_disabled", default=True))
@@ -477,24 +1061,46 @@ class UnbanSelectView(ui.View):
 class PermissionDenied(app_commands.CheckFailure):
     pass
 
+class GuildPermissionIndex:
+    """Int-keyed view of one guild's rules: command -> {user_id: allowed} and command -> [(role_id, allowed)] highest role first."""
+    __slots__ = ("users", "roles")
+
+    def __init__(self, guild: discord.Guild, guild_perms: dict):
+        self.users: dict[str, dict[int, bool]] = {}
+        self.roles: dict[str, list[tuple[int, bool]]] = {}
+        for user_id_str, perms in guild_perms.get("users", {}).items():
+            for command_name, rule in perms.items():
+                self.users.setdefault(command_name, {})[int(user_id_str)] = rule == "allow"
+        ranked = {}
+        for role_id_str, perms in guild_perms.get("roles", {}).items():
+            # Rules for roles that no longer exist can never match a member, so they are left out
+            if not (role := guild.get_role(int(role_id_str))): continue
+            for command_name, rule in perms.items():
+                ranked.setdefault(command_name, []).append((role.position, role.id, rule == "allow"))
+        for command_name, entries in ranked.items():
+            entries.sort(reverse=True)
+            self.roles[command_name] = [(role_id, allowed) for _, role_id, allowed in entries]
+
 class PermissionsManager:
     def __init__(self, bot_instance: MyBot):
         self.bot = bot_instance
         self.permissions = {}
+        self._indexes: dict[int, GuildPermissionIndex] = {}
         self.load_permissions()
 
     def load_permissions(self):
-        self.permissions = load_json_file(PERMISSIONS_FILE)
+        self.permissions = storage.load(PERMISSIONS_FILE)
+        self._indexes.clear()
         print(f"[Permissions] {len(self.permissions)} guild permissions loaded.")
 
-    def save_permissions(self):
-        save_json_file(self.permissions, PERMISSIONS_FILE)
+    def save_permissions(self, guild_id: int | None = None):
+        persistence.schedule_save(PERMISSIONS_FILE, self.permissions, key=None if guild_id is None else str(guild_id))
 
     def _get_guild_perms(self, guild_id: int):
         return self.permissions.setdefault(str(guild_id), {"roles": {}, "users": {}})
 
-    def set_permission(self, guild_id: int, command_name: str, target: Role | User | Member, permission: bool | None):
-        guild_perms = self._get_guild_perms(guild_id)
+    @staticmethod
+    def _set_rule(guild_perms: dict, command_name: str, target: Role | User | Member, permission: bool | None):
         target_id_str = str(target.id)
         target_type = "roles" if isinstance(target, Role) else "users"
         target_perms = guild_perms[target_type].setdefault(target_id_str, {})
@@ -506,7 +1112,37 @@ class PermissionsManager:
                     del guild_perms[target_type][target_id_str]
         else:
             target_perms[command_name] = "allow" if permission else "deny"
-        self.save_permissions()
+
+    def set_permission(self, guild_id: int, command_name: str, target: Role | User | Member, permission: bool | None):
+        self.apply_permissions(guild_id, [command_name], [target], permission)
+
+    def apply_permissions(self, guild_id: int, command_names: list[str], targets: list[Role | User | Member], permission: bool | None):
+        """Applies one rule to every command x target pair in memory, then rebuilds and persists once."""
+        guild_perms = self._get_guild_perms(guild_id)
+        for command_name in command_names:
+            for target in targets:
+                self._set_rule(guild_perms, command_name, target, permission)
+        self.invalidate_index(guild_id)
+        self.save_permissions(guild_id)
+
+    def command_rules(self, guild: discord.Guild, command_name: str) -> tuple[list[int], list[int], list[int], list[int]]:
+        """Reverse lookup for one command: (allowed role ids, denied role ids, allowed user ids, denied user ids)."""
+        if not (index := self._get_index(guild)): return [], [], [], []
+        roles = index.roles.get(command_name, ())
+        users = index.users.get(command_name, {})
+        return ([role_id for role_id, allowed in roles if allowed], [role_id for role_id, allowed in roles if not allowed],
+                [user_id for user_id, allowed in users.items() if allowed], [user_id for user_id, allowed in users.items() if not allowed])
+
+    def invalidate_index(self, guild_id: int):
+        """Drops the compiled index; called when rules change or the guild's roles are created, moved or deleted."""
+        self._indexes.pop(guild_id, None)
+
+    def _get_index(self, guild: discord.Guild) -> GuildPermissionIndex | None:
+        index = self._indexes.get(guild.id)
+        if index is None:
+            if not (guild_perms := self.permissions.get(str(guild.id))): return None
+            index = self._indexes[guild.id] = GuildPermissionIndex(guild, guild_perms)
+        return index
 
     def check(self, interaction: Interaction) -> bool:
         if not interaction.guild or not interaction.command: return True
@@ -515,19 +1151,17 @@ class PermissionsManager:
         if isinstance(user, Member) and user.guild_permissions.administrator: return True
         
         command_name = interaction.command.name
-        guild_id_str = str(interaction.guild.id)
-        user_id_str = str(user.id)
-        guild_perms = self.permissions.get(guild_id_str)
-        if not guild_perms: return False
+        guild = interaction.guild
+        index = self._get_index(guild)
+        if not index: return False
         
-        user_rule = guild_perms.get("users", {}).get(user_id_str, {}).get(command_name)
-        if user_rule is not None: return user_rule == "allow"
+        user_rule = index.users.get(command_name, {}).get(user.id)
+        if user_rule is not None: return user_rule
         
         if isinstance(user, Member):
-            sorted_roles = sorted(user.roles, key=lambda r: r.position, reverse=True)
-            for role in sorted_roles:
-                role_rule = guild_perms.get("roles", {}).get(str(role.id), {}).get(command_name)
-                if role_rule is not None: return role_rule == "allow"
+            # Highest ruled role the member holds wins; @everyone (id == guild id) is held by everyone
+            for role_id, allowed in index.roles.get(command_name, ()):
+                if role_id == guild.id or user.get_role(role_id): return allowed
         
         return False
 
@@ -581,15 +1215,15 @@ class PermissionEditorView(ui.View):
             command_name = self.command_names[0]
             embed = Embed(title=localizer.get_string(gid, "perms_edit_embed_title_single", command=command_name),
                           description=localizer.get_string(gid, "perms_edit_embed_desc"), color=Color.orange())
-            guild_perms = self.manager._get_guild_perms(gid)
+            roles_allow, roles_deny, users_allow, users_deny = self.manager.command_rules(self.guild, command_name)
             
-            role_perms_allow = [f"<@&{role_id}>" for role_id, perms in guild_perms.get("roles", {}).items() if perms.get(command_name) == "allow"]
-            role_perms_deny = [f"<@&{role_id}>" for role_id, perms in guild_perms.get("roles", {}).items() if perms.get(command_name) == "deny"]
+            role_perms_allow = [f"<@&{role_id}>" for role_id in roles_allow]
+            role_perms_deny = [f"<@&{role_id}>" for role_id in roles_deny]
             embed.add_field(name=localizer.get_string(gid, "perms_allowed_roles"), value=", ".join(role_perms_allow) or "N/A", inline=False)
             embed.add_field(name=localizer.get_string(gid, "perms_denied_roles"), value=", ".join(role_perms_deny) or "N/A", inline=False)
             
-            user_perms_allow = [f"<@{user_id}>" for user_id, perms in guild_perms.get("users", {}).items() if perms.get(command_name) == "allow"]
-            user_perms_deny = [f"<@{user_id}>" for user_id, perms in guild_perms.get("users", {}).items() if perms.get(command_name) == "deny"]
+            user_perms_allow = [f"<@{user_id}>" for user_id in users_allow]
+            user_perms_deny = [f"<@{user_id}>" for user_id in users_deny]
             embed.add_field(name=localizer.get_string(gid, "perms_allowed_users"), value=", ".join(user_perms_allow) or "N/A", inline=False)
             embed.add_field(name=localizer.get_string(gid, "perms_denied_users"), value=", ".join(user_perms_deny) or "N/A", inline=False)
             embed.set_footer(text=localizer.get_string(gid, "perms_footer_instant"))
@@ -607,9 +1241,7 @@ class PermissionEditorView(ui.View):
             await interaction.response.send_message(localizer.get_string(gid, "perms_no_target_selected"), ephemeral=True)
             return
 
-        for command in self.command_names:
-            for target in targets:
-                self.manager.set_permission(self.guild.id, command, target, permission)
+        self.manager.apply_permissions(self.guild.id, self.command_names, targets, permission)
         
         new_embed = self.create_permissions_embed()
         if self.message:
@@ -681,210 +1313,687 @@ class AccessDashboardView(ui.View):
         embed = editor_view.create_permissions_embed()
         await interaction.edit_original_response(embed=embed, view=editor_view)
 
+class OrderedMembership:
+    """Insertion-ordered set of user ids for a main/reserve list: O(1) contains, append and remove,
+    O(1) amortized FIFO promotion. Iterates in list order and serializes to the plain JSON list."""
+    __slots__ = ("_members", "_queue", "_tokens", "version")
+
+    def __init__(self, user_ids=()):
+        self._members: dict[int, int] = {} # user_id -> token of its live queue entry
+        self._queue: deque[tuple[int, int]] = deque()
+        self._tokens = itertools.count()
+        self.version = 0 # Bumped on every change, so renders can tell whether the order is still the one they saw
+        for user_id in user_ids:
+            self.append(user_id)
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def append(self, user_id: int):
+        if user_id in self._members: return
+        token = next(self._tokens)
+        self._members[user_id] = token
+        self._queue.append((user_id, token))
+        self.version += 1
+
+    def remove(self, user_id: int):
+        del self._members[user_id]
+        self.version += 1
+        # Removed entries stay in the queue and are skipped on promotion; rebuild once they dominate
+        if len(self._queue) > 2 * len(self._members) + 32:
+            self._queue = deque((uid, token) for uid, token in self._members.items())
+
+    def pop_first(self) -> int:
+        while True:
+            user_id, token = self._queue.popleft()
+            if self._members.get(user_id) == token:
+                del self._members[user_id]
+                self.version += 1
+                return user_id
+
+    def position(self, user_id: int) -> int | None:
+        """1-based slot of a user, as shown in the rendered list."""
+        return next((i for i, uid in enumerate(self._members, 1) if uid == user_id), None)
+
+    def to_json(self) -> list[int]:
+        return list(self._members)
+
+class ListJournal:
+    """Append-only NDJSON log of list membership events, folded into the list snapshot by compaction."""
+    def __init__(self, journal_file: str, compact_threshold: int):
+        self.journal_file = journal_file
+        self.rotated_file = f"{journal_file}.compacting"
+        self.compact_threshold = compact_threshold
+        self.seq = 0
+        self._handle = None
+        self._size = 0
+
+    def read_events(self):
+        # A journal left behind by an interrupted compaction is older than the live one, so it replays first
+        for path in (self.rotated_file, self.journal_file):
+            if not os.path.exists(path): continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # Torn last line after a crash
+                    self.seq = max(self.seq, event["seq"])
+                    yield event
+
+    def append(self, list_id: str, user_id: int, op: str) -> bool:
+        """Writes one event line. Returns True once the journal has outgrown the compaction threshold."""
+        if self._handle is None:
+            # Line buffered, so every event reaches the OS as soon as it is written
+            self._handle = open(self.journal_file, 'a', encoding='utf-8', buffering=1)
+            self._size = self._handle.tell()
+        self.seq += 1
+        line = json.dumps({"seq": self.seq, "l": list_id, "u": user_id, "op": op, "ts": int(time.time())}, separators=(",", ":")) + "\n"
+        self._handle.write(line)
+        self._size += len(line)
+        return self._size >= self.compact_threshold
+
+    def rotate(self):
+        """Moves the live journal aside so new events land in a fresh file while the snapshot is written."""
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+        if not os.path.exists(self.journal_file): return
+        if os.path.exists(self.rotated_file):
+            with open(self.rotated_file, 'a', encoding='utf-8') as dst, open(self.journal_file, 'r', encoding='utf-8') as src:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.journal_file)
+        else:
+            os.replace(self.journal_file, self.rotated_file)
+
+    def discard_rotated(self):
+        if os.path.exists(self.rotated_file):
+            os.remove(self.rotated_file)
+
+class ListArchive:
+    """Closed lists, appended as gzip members to one NDJSON segment per month and read back as a stream."""
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _segment(self, timestamp: int) -> str:
+        month = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y-%m")
+        return os.path.join(self.directory, f"lists-{month}.ndjson.gz")
+
+    def append(self, entry: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        # Every append adds a self-contained gzip member, so nothing already archived is ever rewritten
+        with gzip.open(self._segment(entry["closed_at"]), 'at', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def iter_guild(self, guild_id: int):
+        """Yields a guild's archived lists newest first, holding at most one month of that guild's entries in memory."""
+        if not os.path.isdir(self.directory): return
+        needle = f'"guild_id":{guild_id},'
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not (name.startswith("lists-") and name.endswith(".ndjson.gz")): continue
+            entries = []
+            try:
+                with gzip.open(os.path.join(self.directory, name), 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        if needle not in line: continue # Other guilds' entries are skipped without parsing
+                        try:
+                            entries.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue
+            except (OSError, EOFError) as e:
+                # A segment cut short by a crash still yields everything before the damage
+                print(f"[ListArchive] Stopped reading {name} early: {e}")
+            yield from reversed(entries)
+
+    def read_page(self, guild_id: int, page: int, page_size: int) -> tuple[list[dict], bool]:
+        """One page of a guild's history and whether another follows; segments past the page are never opened."""
+        entries = list(itertools.islice(self.iter_guild(guild_id), page * page_size, (page + 1) * page_size + 1))
+        return entries[:page_size], len(entries) > page_size
+
+class ListRenderScheduler:
+    """Collapses re-renders per list: at most one edit per interval, and the last edit always shows the latest state.
+    `render` returns whether it actually edited the message and raises if the edit failed; failed edits are retried."""
+    def __init__(self, render: Callable[[str], Awaitable[bool]], interval: float, retries: int = LIST_RENDER_RETRIES,
+                 stats_interval: float = LIST_RENDER_STATS_INTERVAL):
+        self.render = render
+        self.interval = interval
+        self.retries = retries
+        self.stats_interval = stats_interval
+        self._pending: set[str] = set()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._last_sent: dict[str, float] = {}
+        self._failures: dict[str, int] = {}
+        self._last_logged = time.monotonic()
+        self.requested = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.retried = 0
+
+    def request(self, list_id: str):
+        self.requested += 1
+        self._failures.pop(list_id, None)
+        if list_id in self._pending:
+            # An edit is already queued and will read the state as it is when it runs
+            self.coalesced += 1
+            return
+        self._pending.add(list_id)
+        if not (task := self._tasks.get(list_id)) or task.done():
+            self._tasks[list_id] = asyncio.create_task(self._run(list_id))
+
+    async def _run(self, list_id: str):
+        while list_id in self._pending:
+            if (wait := self._last_sent.get(list_id, 0) + self.interval - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            # Requests arriving from here on were not seen by this render and queue another one
+            self._pending.discard(list_id)
+            try:
+                edited = await self.render(list_id)
+            except Exception as e:
+                self.failed += 1
+                failures = self._failures[list_id] = self._failures.get(list_id, 0) + 1
+                if failures <= self.retries:
+                    # The message still shows an older state, so the list goes back in the queue
+                    print(f"[ListRender] Error rendering list {list_id}, retrying ({failures}/{self.retries}): {e}")
+                    self.retried += 1
+                    self._pending.add(list_id)
+                else:
+                    print(f"[ListRender] Error rendering list {list_id}, giving up until the next change: {e}")
+                    self._failures.pop(list_id, None)
+            else:
+                self._failures.pop(list_id, None)
+                if not edited:
+                    self.unchanged += 1
+                    continue
+                self.sent += 1
+            self._last_sent[list_id] = time.monotonic()
+        if time.monotonic() - self._last_logged >= self.stats_interval:
+            self._last_logged = time.monotonic()
+            print(f"[ListRender] {self}")
+
+    def __str__(self):
+        return (f"requested {self.requested}, coalesced {self.coalesced}, sent {self.sent}, unchanged {self.unchanged}, "
+                f"failed {self.failed}, retried {self.retried}")
+
 class PersistentListManager:
     def __init__(self, bot_instance: MyBot):
         self.bot = bot_instance
-        self.lists_data = {}
+        self.lists_data: dict[str, dict] = {}
+        self._guild_lists: dict[int, dict[str, None]] = {} # guild_id -> list IDs in creation order
+        self.journal = ListJournal(LIST_JOURNAL_FILE, LIST_JOURNAL_COMPACT_BYTES)
+        self.archive = ListArchive(LIST_ARCHIVE_DIR)
+        self._compact_task: asyncio.Task | None = None
+        self._list_messages: dict[str, discord.PartialMessage] = {}
+        self.renderer = ListRenderScheduler(self._edit_list_message, LIST_RENDER_INTERVAL)
+        self._list_locks: dict[str, asyncio.Lock] = {}
+        self._role_updates: dict[int, dict[int, str]] = {} # guild_id -> user_id -> status that triggered the update
+        self._role_workers: dict[int, asyncio.Task] = {}
+        self._list_roles: dict[int, dict[str, int]] = {}
+        self._fragments: dict[str, tuple[int, dict[str, str]]] = {}
+        self._member_lines: dict[int, dict[int, str]] = {}
+        self._line_generation: dict[int, int] = {} # guild_id -> bumped whenever a cached member line is dropped
+        self._sections: dict[str, dict[str, tuple]] = {} # list_id -> section -> (members, version, line generation, text)
+        self._posted_content: dict[str, tuple[int, str]] = {}
         self.load_lists_data()
 
+    def _cached_role(self, guild: discord.Guild, role_name: str) -> discord.Role | None:
+        """Resolves a list role by its cached ID, falling back to a name scan only when the cache is cold."""
+        role_ids = self._list_roles.setdefault(guild.id, {})
+        if (role_id := role_ids.get(role_name)) and (role := guild.get_role(role_id)):
+            return role
+        if role := discord.utils.get(guild.roles, name=role_name):
+            role_ids[role_name] = role.id
+        else:
+            role_ids.pop(role_name, None)
+        return role
+
+    def invalidate_list_roles(self, guild_id: int):
+        self._list_roles.pop(guild_id, None)
+
     async def _ensure_role(self, guild: discord.Guild, role_name: str) -> discord.Role | None:
         if not guild: return None
-        role = discord.utils.get(guild.roles, name=role_name)
+        role = self._cached_role(guild, role_name)
         if not role:
             try:
                 if not guild.me.guild_permissions.manage_roles: return None
                 role = await guild.create_role(name=role_name, reason=f"Persistent list system role: {role_name}")
+                self._list_roles.setdefault(guild.id, {})[role_name] = role.id
             except (discord.Forbidden, Exception) as e:
                 print(f"[ListManager] Error creating role '{role_name}': {e}")
                 return None
         return role
 
     async def _update_member_roles(self, member: Member | None, guild: discord.Guild, list_status: str | None):
+        """Brings the member's roles for every list of the guild in line with their statuses using a single edit,
+        or none if they already match. `list_status` is the change that triggered it and only picks the audit log reason."""
         if not member or not guild or not guild.me.guild_permissions.manage_roles: return
-        role_in = await self._ensure_role(guild, ROLE_LIST_IN_NAME)
-        role_reserve = await self._ensure_role(guild, ROLE_LIST_RESERVE_NAME)
+        managed_names, target_names = set(), set()
+        for list_id in self.guild_list_ids(guild.id):
+            list_data = self.lists_data[list_id]
+            managed_names.update(list_data["roles"].values())
+            status = "main" if member.id in list_data["main"] else "reserve" if member.id in list_data["reserve"] else None
+            if status: target_names.add(list_data["roles"][status])
+        # Only the roles the member should end up with are created; the others are merely looked up for removal
+        targets = [role for name in target_names if (role := await self._ensure_role(guild, name))]
+        list_role_ids = {role.id for name in managed_names if (role := self._cached_role(guild, name))}
+        current = [r for r in member.roles if not r.is_default()]
+        desired = [r for r in current if r.id not in list_role_ids] + targets
+        if {r.id for r in desired} == {r.id for r in current}: return
         try:
-            if list_status == "main":
-                if role_in: await member.add_roles(role_in, reason="Joined main list")
-                if role_reserve and role_reserve in member.roles: await member.remove_roles(role_reserve, reason="Moved to main list")
-            elif list_status == "reserve":
-                if role_reserve: await member.add_roles(role_reserve, reason="Joined reserve list")
-                if role_in and role_in in member.roles: await member.remove_roles(role_in, reason="Moved to reserve list")
-            elif list_status is None or list_status == "none":
-                if role_in and role_in in member.roles: await member.remove_roles(role_in, reason="Left list")
-                if role_reserve and role_reserve in member.roles: await member.remove_roles(role_reserve, reason="Left list")
+            await member.edit(roles=desired, reason=LIST_STATUS_ROLE_REASONS.get(list_status, "Left list"))
         except (discord.Forbidden, Exception) as e:
             print(f"[ListManager] Error updating roles for {member.display_name}: {e}")
 
     def load_lists_data(self):
-        raw = load_json_file(PERSISTENT_LIST_DATA_FILE)
-        if raw:
-            self.lists_data = {int(k): v for k, v in raw.items()}
-
-    def save_lists_data(self):
-        save_json_file(self.lists_data, PERSISTENT_LIST_DATA_FILE)
-
-    def _get_guild_list_data(self, guild_id: int):
-        return self.lists_data.setdefault(guild_id, {"channel_id": None, "message_id": None, "main": [], "reserve": [], "locked": False})
-
-    def generate_list_content_string(self, guild: discord.Guild) -> str:
+        for list_id, record in storage.load(PERSISTENT_LIST_DATA_FILE).items():
+            # Records from before lists had their own IDs were keyed by guild; that key stays their list ID
+            record.setdefault("guild_id", int(list_id))
+            record.setdefault("max_slots", MAX_MAIN_LIST_SLOTS)
+            record.setdefault("roles", dict(LIST_STATUS_ROLES))
+            record["main"] = OrderedMembership(record.get("main", []))
+            record["reserve"] = OrderedMembership(record.get("reserve", []))
+            self._register_list(list_id, record)
+        replayed = 0
+        for event in self.journal.read_events():
+            record = self.lists_data.get(event.get("l") or str(event["g"]))
+            # Every record remembers the last journal event it already contains
+            if record is None or event["seq"] <= record.get("journal_seq", 0): continue
+            self._apply_list_event(record, event["u"], event["op"])
+            replayed += 1
+        self.journal.seq = max([self.journal.seq] + [d.get("journal_seq", 0) for d in self.lists_data.values()])
+        # Only posted, open lists stay in memory; locked or orphaned records left by older versions move to the archive
+        stale = [list_id for list_id, d in self.lists_data.items() if d.get("locked", False) or not d.get("message_id")]
+        for list_id in stale:
+            entry = self._drop_list(list_id, "locked" if self.lists_data[list_id].get("locked", False) else "deleted")
+            if entry["main"] or entry["reserve"]:
+                self.archive.append(entry)
+        if stale: self.save_lists_data()
+        print(f"[ListManager] {len(self.lists_data)} lists loaded, {replayed} journal events replayed, {len(stale)} stale lists archived.")
+
+    def save_lists_data(self, list_id: str | None = None):
+        for lid in (self.lists_data if list_id is None else [list_id]):
+            if lid in self.lists_data:
+                self.lists_data[lid]["journal_seq"] = self.journal.seq
+        persistence.schedule_save(PERSISTENT_LIST_DATA_FILE, self.lists_data, key=list_id)
+
+    @staticmethod
+    def _apply_list_event(list_data: dict, user_id: int, op: str):
+        # Ops are idempotent so replaying an event the snapshot already holds changes nothing
+        if op != "main" and user_id in list_data["main"]: list_data["main"].remove(user_id)
+        if op != "reserve" and user_id in list_data["reserve"]: list_data["reserve"].remove(user_id)
+        if op in ("main", "reserve") and user_id not in list_data[op]: list_data[op].append(user_id)
+
+    def _journal_list_event(self, list_id: str, user_id: int, op: str):
+        """Records a single join/leave as one appended line instead of rewriting the list snapshot."""
+        if self.journal.append(list_id, user_id, op) and (not self._compact_task or self._compact_task.done()):
+            self._compact_task = asyncio.create_task(self._compact_journal())
+
+    async def _compact_journal(self):
+        self.journal.rotate()
+        self.save_lists_data()
+        await persistence.flush()
+        if persistence.is_dirty(PERSISTENT_LIST_DATA_FILE):
+            print("[ListManager] Snapshot write failed, keeping the rotated journal for the next compaction.")
+            return
+        self.journal.discard_rotated()
+        print(f"[ListManager] Journal compacted into snapshot at seq {self.journal.seq}.")
+
+    def _register_list(self, list_id: str, record: dict):
+        self.lists_data[list_id] = record
+        self._guild_lists.setdefault(record["guild_id"], {})[list_id] = None
+
+    def _drop_list(self, list_id: str, reason: str) -> dict:
+        """Removes a list from the hot set and returns its archive entry."""
+        list_data = self.lists_data.pop(list_id)
+        self._guild_lists.get(list_data["guild_id"], {}).pop(list_id, None)
+        for cache in (self._posted_content, self._list_messages, self._list_locks, self._sections):
+            cache.pop(list_id, None)
+        return {"guild_id": list_data["guild_id"], "list_id": list_id, "channel_id": list_data["channel_id"], "created_at": list_data.get("created_at"),
+                "closed_at": int(time.time()), "reason": reason, "max_slots": list_data["max_slots"],
+                "main": list_data["main"].to_json(), "reserve": list_data["reserve"].to_json()}
+
+    async def archive_list(self, list_id: str, reason: str):
+        """Moves a closed list with its final participants out of memory and into the monthly archive."""
+        if list_id not in self.lists_data: return
+        entry = self._drop_list(list_id, reason)
+        self.save_lists_data(list_id)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.archive.append, entry)
+        except OSError as e:
+            print(f"[ListArchive] Could not archive list {list_id}: {e}")
+
+    def get_list(self, list_id: str | None) -> dict | None:
+        return self.lists_data.get(list_id) if list_id else None
+
+    def guild_list_ids(self, guild_id: int) -> list[str]:
+        """The guild's lists, newest first."""
+        return list(reversed(self._guild_lists.get(guild_id, {})))
+
+    def _open_list_ids(self, guild_id: int) -> list[str]:
+        return [lid for lid in self._guild_lists.get(guild_id, {}) if (d := self.lists_data[lid])["message_id"] and not d.get("locked", False)]
+
+    def resolve_list(self, guild_id: int, list_id: str | None = None) -> tuple[str | None, dict | None]:
+        """Finds the list a command targets: the one selected, otherwise the newest posted list of the guild, open ones first."""
+        if list_id is not None:
+            record = self.lists_data.get(list_id)
+            return (list_id, record) if record and record["guild_id"] == guild_id else (None, None)
+        posted = [lid for lid in self.guild_list_ids(guild_id) if self.lists_data[lid]["message_id"]]
+        list_id = next((lid for lid in posted if not self.lists_data[lid].get("locked", False)), posted[0] if posted else None)
+        return list_id, self.lists_data.get(list_id)
+
+    def create_list(self, guild_id: int, max_slots: int = MAX_MAIN_LIST_SLOTS) -> tuple[str, dict]:
+        while (list_id := os.urandom(4).hex()) in self.lists_data: pass
+        # Each open list gets its own pair of roles; the first one keeps the classic names
+        taken = {self.lists_data[lid]["roles"]["main"] for lid in self._open_list_ids(guild_id)}
+        n, suffix = 1, ""
+        while f"{ROLE_LIST_IN_NAME}{suffix}" in taken:
+            n += 1
+            suffix = f" {n}"
+        record = {"guild_id": guild_id, "channel_id": None, "message_id": None, "main": OrderedMembership(), "reserve": OrderedMembership(),
+                  "locked": False, "max_slots": max_slots, "created_at": int(time.time()), "roles": {status: f"{name}{suffix}" for status, name in LIST_STATUS_ROLES.items()}}
+        self._register_list(list_id, record)
+        return list_id, record
+
+    def discard_list(self, list_id: str):
+        """Forgets a list that never made it into a message, e.g. when posting it failed."""
+        if list_id not in self.lists_data: return
+        self._drop_list(list_id, "deleted")
+        self.save_lists_data(list_id)
+
+    async def reset_list(self, guild: discord.Guild, list_id: str, max_slots: int | None = None):
+        """Empties a list before it is posted again. Every removal is journaled and the members lose their list roles."""
+        async with self._list_lock(list_id):
+            list_data = self.lists_data[list_id]
+            removed = [*list_data["main"], *list_data["reserve"]]
+            for user_id in removed:
+                self._journal_list_event(list_id, user_id, "leave")
+            list_data.update({"main": OrderedMembership(), "reserve": OrderedMembership()})
+            if max_slots: list_data["max_slots"] = max_slots
+        for user_id in removed:
+            self._queue_role_update(guild, user_id, "none")
+
+    async def ensure_list_roles(self, guild: discord.Guild, list_data: dict):
+        for role_name in list_data["roles"].values():
+            await self._ensure_role(guild, role_name)
+
+    def _list_fragments(self, guild_id: int) -> dict[str, str]:
+        """The fixed localized pieces of a list, shared by every guild using the same language."""
+        lang = localizer.get_language(guild_id)
+        cached = self._fragments.get(lang)
+        if cached and cached[0] == localizer.generation:
+            return cached[1]
+        fragments = {key: localizer.get_string(guild_id, key) for key in ("list_header", "list_empty", "list_footer", "list_locked_footer")}
+        self._fragments[lang] = (localizer.generation, fragments)
+        return fragments
+
+    def _section_text(self, guild: discord.Guild, list_id: str, section: str) -> str:
+        """The numbered member lines of a section. Only rebuilt after the section or one of the guild's member lines changed,
+        and then only the lines of members not seen before need a guild.get_member lookup."""
+        members = self.lists_data[list_id][section]
+        generation = self._line_generation.get(guild.id, 0)
+        sections = self._sections.setdefault(list_id, {})
+        cached = sections.get(section)
+        if cached and cached[0] is members and cached[1] == members.version and cached[2] == generation:
+            return cached[3]
+        lines = self._member_lines.setdefault(guild.id, {})
+        text = "\n".join([f"{i}. {lines.get(user_id) or self._new_member_line(guild, lines, user_id)}" for i, user_id in enumerate(members, 1)])
+        sections[section] = (members, members.version, generation, text)
+        return text
+
+    @staticmethod
+    def _new_member_line(guild: discord.Guild, lines: dict[int, str], user_id: int) -> str:
+        member = guild.get_member(user_id)
+        line = lines[user_id] = member.mention if member else f"ID: {user_id}"
+        return line
+
+    def invalidate_member_line(self, guild_id: int, user_id: int):
+        if (lines := self._member_lines.get(guild_id)) and lines.pop(user_id, None) is not None:
+            self._line_generation[guild_id] = self._line_generation.get(guild_id, 0) + 1
+
+    def generate_list_content_string(self, guild: discord.Guild, list_id: str) -> str:
         gid = guild.id
-        guild_data = self._get_guild_list_data(gid)
-        header = f"{localizer.get_string(gid, 'list_header')}\n"
-        main_list = [f"{i+1}. {guild.get_member(uid).mention if guild.get_member(uid) else f'ID: {uid}'}" for i, uid in enumerate(guild_data["main"])]
-        reserve_list = [f"{i+1}. {guild.get_member(uid).mention if guild.get_member(uid) else f'ID: {uid}'}" for i, uid in enumerate(guild_data["reserve"])]
-        main_title = localizer.get_string(gid, "list_main_title", count=len(main_list), max=MAX_MAIN_LIST_SLOTS)
-        main_content = "\n".join(main_list) or localizer.get_string(gid, "list_empty")
-        reserve_title = localizer.get_string(gid, "list_reserve_title", count=len(reserve_list))
-        reserve_content = "\n".join(reserve_list) or localizer.get_string(gid, "list_empty")
-        footer = f"\n\n{localizer.get_string(gid, 'list_locked_footer' if guild_data.get('locked', False) else 'list_footer')}"
-        return f"{header}\n{main_title}\n{main_content}\n\n{reserve_title}\n{reserve_content}{footer}"
-
-    async def update_list_message(self, guild_id: int, interaction: discord.Interaction | None = None, channel: discord.TextChannel | None = None):
-        guild_data = self._get_guild_list_data(guild_id)
-        if not guild_data["channel_id"] or not guild_data["message_id"]: return
-        target_channel = channel or self.bot.get_channel(guild_data["channel_id"])
-        if not isinstance(target_channel, TextChannel): return
+        list_data = self.lists_data[list_id]
+        fragments = self._list_fragments(gid)
+        main_title = localizer.get_string(gid, "list_main_title", count=len(list_data["main"]), max=list_data["max_slots"])
+        main_content = self._section_text(guild, list_id, "main") or fragments["list_empty"]
+        reserve_title = localizer.get_string(gid, "list_reserve_title", count=len(list_data["reserve"]))
+        reserve_content = self._section_text(guild, list_id, "reserve") or fragments["list_empty"]
+        footer = fragments["list_locked_footer" if list_data.get("locked", False) else "list_footer"]
+        return f"{fragments['list_header']}\n\n{main_title}\n{main_content}\n\n{reserve_title}\n{reserve_content}\n\n{footer}"
+
+    def reset_render_cache(self, guild_id: int, list_id: str):
+        self._member_lines.pop(guild_id, None)
+        self._line_generation[guild_id] = self._line_generation.get(guild_id, 0) + 1
+        self._posted_content.pop(list_id, None)
+
+    def mark_posted(self, list_id: str, message_id: int, content: str):
+        """Records what the list message currently shows, so re-renders producing the same text skip the edit."""
+        self._posted_content[list_id] = (message_id, content)
+
+    def _list_message(self, list_id: str, channel: TextChannel, message_id: int) -> discord.PartialMessage:
+        # Editing through a partial message needs no fetch; a vanished message still surfaces as NotFound on edit
+        message = self._list_messages.get(list_id)
+        if not message or message.id != message_id or message.channel.id != channel.id:
+            message = self._list_messages[list_id] = channel.get_partial_message(message_id)
+        return message
+
+    async def _edit_list_message(self, list_id: str, channel: discord.TextChannel | None = None) -> bool:
+        """Edits the list message if its content changed. Returns whether an edit was sent; other errors than a deleted message propagate."""
+        if not (list_data := self.lists_data.get(list_id)): return False
+        if not list_data["channel_id"] or not list_data["message_id"]: return False
+        target_channel = channel or self.bot.get_channel(list_data["channel_id"])
+        if not isinstance(target_channel, TextChannel): return False
         try:
-            message = await target_channel.fetch_message(guild_data["message_id"])
-            view = None if guild_data.get("locked", False) else PersistentListView(self, guild_id)
-            await message.edit(content=self.generate_list_content_string(target_channel.guild), view=view)
-            self.save_lists_data()
+            message = self._list_message(list_id, target_channel, list_data["message_id"])
+            content = self.generate_list_content_string(target_channel.guild, list_id)
+            if self._posted_content.get(list_id) == (message.id, content): return False
+            view = None if list_data.get("locked", False) else PersistentListView(self, list_id, list_data["guild_id"])
+            await message.edit(content=content, view=view)
         except discord.NotFound:
-            guild_data.update({"message_id": None, "channel_id": None, "main": [], "reserve": []})
-            self.save_lists_data()
+            await self.archive_list(list_id, "deleted")
+            return False
+        self.mark_posted(list_id, message.id, content)
+        if view and not list_data.get("stable_view"):
+            list_data["stable_view"] = True
+            self.save_lists_data(list_id)
+        return True
+
+    async def update_list_message(self, list_id: str, interaction: discord.Interaction | None = None, channel: discord.TextChannel | None = None) -> bool:
+        try:
+            return await self._edit_list_message(list_id, channel)
         except Exception as e:
-            print(f"[ListManager] Error updating list message for guild {guild_id}: {e}")
+            print(f"[ListManager] Error updating list message for list {list_id}: {e}")
+            return False
 
-    async def add_user(self, guild_id: int, user_id: int, interaction: discord.Interaction):
+    def _list_lock(self, list_id: str) -> asyncio.Lock:
+        return self._list_locks.setdefault(list_id, asyncio.Lock())
+
+    def _queue_role_update(self, guild: discord.Guild, user_id: int, list_status: str):
+        """Queues a member's list role reconciliation. One worker per guild applies them, so clicks on two lists never
+        edit the same member concurrently, and rapid clicks by the same member collapse into one edit."""
+        self._role_updates.setdefault(guild.id, {})[user_id] = list_status
+        if not (task := self._role_workers.get(guild.id)) or task.done():
+            self._role_workers[guild.id] = asyncio.create_task(self._process_role_updates(guild))
+
+    async def _process_role_updates(self, guild: discord.Guild):
+        pending = self._role_updates.get(guild.id, {})
+        while pending:
+            user_id = next(iter(pending))
+            list_status = pending.pop(user_id)
+            await self._update_member_roles(guild.get_member(user_id), guild, list_status)
+
+    async def _notify_promoted(self, channel, guild_id: int, member: Member):
+        try:
+            await channel.send(localizer.get_string(guild_id, "list_msg_promoted_notification", user=member.mention), allowed_mentions=discord.AllowedMentions(users=True))
+        except discord.Forbidden:
+            pass
+
+    async def add_user(self, list_id: str, user_id: int, interaction: discord.Interaction):
         if not interaction.guild or not isinstance(interaction.user, Member): return
-        gid = guild_id
-        guild_data = self._get_guild_list_data(gid)
-        if guild_data.get("locked", False):
-            await interaction.response.send_message(localizer.get_string(gid, "list_locked_short"), ephemeral=True); return
-        if user_id in guild_data["main"]:
-            await interaction.response.send_message(localizer.get_string(gid, "list_err_already_in_main"), ephemeral=True); return
-        
-        current_list = "main" if len(guild_data["main"]) < MAX_MAIN_LIST_SLOTS else "reserve"
-        
-        if user_id in guild_data["reserve"]:
-            if current_list == "main":
-                guild_data["reserve"].remove(user_id)
-                guild_data["main"].append(user_id)
-                await self._update_member_roles(interaction.user, interaction.guild, "main")
-                await interaction.response.send_message(localizer.get_string(gid, "list_msg_promoted_to_main"), ephemeral=True)
+        gid = interaction.guild.id
+        # The whole check-and-mutate runs without awaiting Discord, so concurrent clicks cannot interleave
+        async with self._list_lock(list_id):
+            list_data = self.lists_data.get(list_id)
+            list_status = None
+            if not list_data:
+                msg_key = "list_err_no_list_found"
+            elif list_data.get("locked", False):
+                msg_key = "list_locked_short"
+            elif user_id in list_data["main"]:
+                msg_key = "list_err_already_in_main"
+            elif len(list_data["main"]) < list_data["max_slots"]:
+                msg_key = "list_msg_joined_main"
+                if user_id in list_data["reserve"]:
+                    list_data["reserve"].remove(user_id)
+                    msg_key = "list_msg_promoted_to_main"
+                list_data["main"].append(user_id)
+                list_status = "main"
+            elif user_id in list_data["reserve"]:
+                msg_key = "list_err_already_in_reserve"
             else:
-                await interaction.response.send_message(localizer.get_string(gid, "list_err_already_in_reserve"), ephemeral=True)
-                return
-        elif current_list == "main":
-            guild_data["main"].append(user_id)
-            await self._update_member_roles(interaction.user, interaction.guild, "main")
-            await interaction.response.send_message(localizer.get_string(gid, "list_msg_joined_main"), ephemeral=True)
-        else:
-            guild_data["reserve"].append(user_id)
-            await self._update_member_roles(interaction.user, interaction.guild, "reserve")
-            await interaction.response.send_message(localizer.get_string(gid, "list_msg_joined_reserve"), ephemeral=True)
-            
-        await self.update_list_message(gid, interaction=interaction)
+                list_data["reserve"].append(user_id)
+                msg_key, list_status = "list_msg_joined_reserve", "reserve"
+            if list_status:
+                self._journal_list_event(list_id, user_id, list_status)
 
-    async def remove_user(self, guild_id: int, user_id: int, interaction: discord.Interaction):
-        if not interaction.guild or not isinstance(interaction.user, Member): return
-        gid = guild_id
-        guild_data = self._get_guild_list_data(gid)
-        if guild_data.get("locked", False):
-            await interaction.response.send_message(localizer.get_string(gid, "list_locked_short"), ephemeral=True); return
-        
-        if user_id in guild_data["main"]:
-            guild_data["main"].remove(user_id)
-            await self._update_member_roles(interaction.user, interaction.guild, "none")
-            msg = localizer.get_string(gid, "list_msg_left_main")
-            if guild_data["reserve"]:
-                promoted_user_id = guild_data["reserve"].pop(0)
-                guild_data["main"].append(promoted_user_id)
-                if (promoted_member := interaction.guild.get_member(promoted_user_id)):
-                    await self._update_member_roles(promoted_member, interaction.guild, "main")
-                    if isinstance(interaction.channel, (TextChannel, VoiceChannel, discord.Thread)):
-                        try:
-                            await interaction.channel.send(localizer.get_string(gid, "list_msg_promoted_notification", user=promoted_member.mention), allowed_mentions=discord.AllowedMentions(users=True))
-                        except discord.Forbidden:
-                            pass
-            await interaction.response.send_message(msg, ephemeral=True)
-            await self.update_list_message(gid, interaction=interaction)
-        elif user_id in guild_data["reserve"]:
-            guild_data["reserve"].remove(user_id)
-            await self._update_member_roles(interaction.user, interaction.guild, "none")
-            await interaction.response.send_message(localizer.get_string(gid, "list_msg_left_reserve"), ephemeral=True)
-            await self.update_list_message(gid, interaction=interaction)
-        else:
-            await interaction.response.send_message(localizer.get_string(gid, "list_err_not_on_list"), ephemeral=True)
+        await interaction.response.send_message(localizer.get_string(gid, msg_key), ephemeral=True)
+        if list_status:
+            self._queue_role_update(interaction.guild, user_id, list_status)
+            self.renderer.request(list_id)
 
-    async def move_to_reserve(self, guild_id: int, user_id: int, interaction: discord.Interaction):
+    async def remove_user(self, list_id: str, user_id: int, interaction: discord.Interaction):
         if not interaction.guild or not isinstance(interaction.user, Member): return
-        gid = guild_id
-        guild_data = self._get_guild_list_data(gid)
-        if guild_data.get("locked", False):
-            await interaction.response.send_message(localizer.get_string(gid, "list_locked_short"), ephemeral=True); return
-        if user_id in guild_data["reserve"]:
-            await interaction.response.send_message(localizer.get_string(gid, "list_err_already_in_reserve"), ephemeral=True); return
-        
-        msg = localizer.get_string(gid, "list_msg_joined_reserve_direct")
-        if user_id in guild_data["main"]:
-            guild_data["main"].remove(user_id)
-            msg = localizer.get_string(gid, "list_msg_moved_to_reserve")
-
-        guild_data["reserve"].append(user_id)
-        await self._update_member_roles(interaction.user, interaction.guild, "reserve")
-        await interaction.response.send_message(msg, ephemeral=True)
-        await self.update_list_message(gid, interaction=interaction)
+        gid = interaction.guild.id
+        promoted_user_id = None
+        async with self._list_lock(list_id):
+            list_data = self.lists_data.get(list_id)
+            changed = False
+            if not list_data:
+                msg_key = "list_err_no_list_found"
+            elif list_data.get("locked", False):
+                msg_key = "list_locked_short"
+            elif user_id in list_data["main"]:
+                list_data["main"].remove(user_id)
+                self._journal_list_event(list_id, user_id, "leave")
+                msg_key, changed = "list_msg_left_main", True
+                if list_data["reserve"]:
+                    promoted_user_id = list_data["reserve"].pop_first()
+                    list_data["main"].append(promoted_user_id)
+                    self._journal_list_event(list_id, promoted_user_id, "main")
+            elif user_id in list_data["reserve"]:
+                list_data["reserve"].remove(user_id)
+                self._journal_list_event(list_id, user_id, "leave")
+                msg_key, changed = "list_msg_left_reserve", True
+            else:
+                msg_key = "list_err_not_on_list"
+
+        await interaction.response.send_message(localizer.get_string(gid, msg_key), ephemeral=True)
+        if not changed: return
+        self._queue_role_update(interaction.guild, user_id, "none")
+        if promoted_user_id is not None:
+            self._queue_role_update(interaction.guild, promoted_user_id, "main")
+            if (promoted_member := interaction.guild.get_member(promoted_user_id)) and isinstance(interaction.channel, (TextChannel, VoiceChannel, discord.Thread)):
+                asyncio.create_task(self._notify_promoted(interaction.channel, gid, promoted_member))
+        self.renderer.request(list_id)
+
+    async def move_to_reserve(self, list_id: str, user_id: int, interaction: discord.Interaction):
+        if not interaction.guild or not isinstance(interaction.user, Member): return
+        gid = interaction.guild.id
+        async with self._list_lock(list_id):
+            list_data = self.lists_data.get(list_id)
+            changed = False
+            if not list_data:
+                msg_key = "list_err_no_list_found"
+            elif list_data.get("locked", False):
+                msg_key = "list_locked_short"
+            elif user_id in list_data["reserve"]:
+                msg_key = "list_err_already_in_reserve"
+            else:
+                msg_key = "list_msg_joined_reserve_direct"
+                if user_id in list_data["main"]:
+                    list_data["main"].remove(user_id)
+                    msg_key = "list_msg_moved_to_reserve"
+                list_data["reserve"].append(user_id)
+                self._journal_list_event(list_id, user_id, "reserve")
+                changed = True
+
+        await interaction.response.send_message(localizer.get_string(gid, msg_key), ephemeral=True)
+        if changed:
+            self._queue_role_update(interaction.guild, user_id, "reserve")
+            self.renderer.request(list_id)
+
+    def register_views(self):
+        """Re-attaches the buttons of every open list by custom_id, so no message has to be edited after a restart."""
+        for list_id, data in self.lists_data.items():
+            if data.get("message_id") and not data.get("locked", False):
+                self.bot.add_view(PersistentListView(self, list_id, data["guild_id"]))
 
     async def initialize_lists_on_ready(self):
         print("[ListManager] Initializing lists on ready...")
-        for guild_id, data in list(self.lists_data.items()):
-            if data.get("channel_id") and data.get("message_id") and not data.get("locked", False):
-                if (guild := self.bot.get_guild(guild_id)) and (channel := guild.get_channel(data["channel_id"])):
-                    if isinstance(channel, TextChannel):
-                        try:
-                            await channel.fetch_message(data["message_id"])
-                            await self.update_list_message(guild_id, channel=channel)
-                        except discord.NotFound:
-                            data.update({"channel_id": None, "message_id": None}); self.save_lists_data()
-        print("[ListManager] Finished initializing lists.")
-
-    async def start_new_list_programmatic(self, guild: discord.Guild, channel: TextChannel, clear_participants: bool = True):
-        guild_id = guild.id
-        guild_data = self._get_guild_list_data(guild_id)
-        if guild_data.get("message_id") and not guild_data.get("locked", False):
-            try:
-                if (old_ch := self.bot.get_channel(guild_data["channel_id"])) and isinstance(old_ch, TextChannel):
-                    old_msg = await old_ch.fetch_message(guild_data["message_id"])
-                    await old_msg.edit(view=None, content=self.generate_list_content_string(guild) + f"\n\n**{localizer.get_string(guild_id, 'list_replaced')}**")
-            except Exception as e:
-                print(f"[AutoList] Error disabling old list message: {e}")
-        
-        if clear_participants: guild_data.update({"main": [], "reserve": []})
-        guild_data["locked"] = False
-        await self._ensure_role(guild, ROLE_LIST_IN_NAME)
-        await self._ensure_role(guild, ROLE_LIST_RESERVE_NAME)
-        
+        self.register_views()
+        # Messages posted before custom_ids were stable carry random ones and need a single edit to pick up the new buttons
+        legacy = [list_id for list_id, data in self.lists_data.items()
+                  if data.get("channel_id") and data.get("message_id") and not data.get("locked", False) and not data.get("stable_view")]
+        semaphore = asyncio.Semaphore(LIST_STARTUP_CONCURRENCY)
+        async def upgrade(list_id: str):
+            async with semaphore:
+                await self.update_list_message(list_id)
+        await asyncio.gather(*(upgrade(list_id) for list_id in legacy))
+        print(f"[ListManager] Finished initializing lists ({len(legacy)} legacy message(s) upgraded).")
+
+    async def post_list(self, guild: discord.Guild, channel: TextChannel, list_id: str) -> discord.Message:
+        """Sends a list's message to the channel and makes it the list's live message."""
+        list_data = self.lists_data[list_id]
+        list_data["locked"] = False
+        await self.ensure_list_roles(guild, list_data)
+        content = self.generate_list_content_string(guild, list_id)
+        list_message = await channel.send(content=content, view=PersistentListView(self, list_id, guild.id))
+        self.mark_posted(list_id, list_message.id, content)
+        list_data.update({"channel_id": channel.id, "message_id": list_message.id, "stable_view": True})
+        self.save_lists_data(list_id)
+        return list_message
+
+    async def _retire_list(self, guild: discord.Guild, list_id: str):
+        list_data = self.lists_data[list_id]
+        try:
+            if (old_ch := self.bot.get_channel(list_data["channel_id"])) and isinstance(old_ch, TextChannel):
+                old_msg = await old_ch.fetch_message(list_data["message_id"])
+                await old_msg.edit(view=None, content=self.generate_list_content_string(guild, list_id) + f"\n\n**{localizer.get_string(guild.id, 'list_replaced')}**")
+        except Exception as e:
+            print(f"[AutoList] Error disabling old list message: {e}")
+        await self.archive_list(list_id, "replaced")
+
+    async def start_new_list_programmatic(self, guild: discord.Guild, channel: TextChannel):
+        # Earlier lists stay open for signups; only once the guild hits the cap is its oldest list retired
+        open_lists = self._open_list_ids(guild.id)
+        for old_list_id in open_lists[:max(0, len(open_lists) - MAX_OPEN_LISTS_PER_GUILD + 1)]:
+            await self._retire_list(guild, old_list_id)
+        list_id, _ = self.create_list(guild.id)
         try:
-            list_message = await channel.send(content=self.generate_list_content_string(guild), view=PersistentListView(self, guild_id))
-            guild_data["channel_id"] = channel.id
-            guild_data["message_id"] = list_message.id
-            self.save_lists_data()
+            await self.post_list(guild, channel, list_id)
             return True
         except Exception as e:
             print(f"[AutoList] Error creating list programmatically: {e}")
+            self.discard_list(list_id)
             return False
 
 class PersistentListView(ui.View):
-    def __init__(self, manager: PersistentListManager, guild_id: int):
+    def __init__(self, manager: PersistentListManager, list_id: str, guild_id: int):
         super().__init__(timeout=None)
         self.manager = manager
-        self.guild_id = guild_id
+        self.list_id = list_id
         
-        self.join_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_join"), style=ButtonStyle.success, emoji="✅")
-        self.leave_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_leave"), style=ButtonStyle.danger, emoji="🗑️")
-        self.reserve_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_reserve"), style=ButtonStyle.secondary, emoji="⏳")
+        # Stable custom_ids let bot.add_view route clicks on lists posted before a restart straight to their list
+        self.join_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_join"), style=ButtonStyle.success, emoji="✅", custom_id=f"plist:{list_id}:join")
+        self.leave_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_leave"), style=ButtonStyle.danger, emoji="🗑️", custom_id=f"plist:{list_id}:leave")
+        self.reserve_button = ui.Button(label=localizer.get_string(guild_id, "list_btn_reserve"), style=ButtonStyle.secondary, emoji="⏳", custom_id=f"plist:{list_id}:reserve")
 
         self.join_button.callback = self.join_button_callback
         self.leave_button.callback = self.leave_button_callback
@@ -895,45 +2004,246 @@ class PersistentListView(ui.View):
         self.add_item(self.reserve_button)
 
     async def join_button_callback(self, interaction: Interaction):
-        await self.manager.add_user(self.guild_id, interaction.user.id, interaction)
+        await self.manager.add_user(self.list_id, interaction.user.id, interaction)
 
     async def leave_button_callback(self, interaction: Interaction):
-        await self.manager.remove_user(self.guild_id, interaction.user.id, interaction)
+        await self.manager.remove_user(self.list_id, interaction.user.id, interaction)
 
     async def reserve_button_callback(self, interaction: Interaction):
-        await self.manager.move_to_reserve(self.guild_id, interaction.user.id, interaction)
+        await self.manager.move_to_reserve(self.list_id, interaction.user.id, interaction)
 
 list_manager = PersistentListManager(bot)
+invite_pool = InvitePool(bot, INVITE_POOL_SIZE, INVITE_MAX_AGE)
 ban_manager = BanManager(bot, localizer)
 permissions_manager = PermissionsManager(bot)
 
-def parse_turf_message(msg):
+class TurfReport(NamedTuple):
+    attacker: str
+    begin: str
+    zonename: str
+    zonenumber: str
+
+# One scan over the report: each match is either a "Key:" line we care about or the line naming the attacker
+TURF_REPORT_PATTERN = re.compile(r"^(?:Beginn:(?P<begin>.*)|Zonenname:(?P<zonename>.*)|Zonennummer:(?P<zonenumber>.*))$|Angriff von[ \t]*(?P<attacker>.*)$", re.M)
+
+def parse_turf_message(msg: str) -> TurfReport | None:
     if "Auf eure Organisation" not in msg: return None
-    lines = msg.splitlines()
-    attacker = next((l.split("Angriff von ")[1].split(" ver")[0].strip() for l in lines if "Angriff von" in l), "Unknown")
-    begin = next((l.split()[-1][:5] for l in lines if l.startswith("Beginn:")), "??:??")
-    zonename = next((l.split(":", 1)[1].strip() for l in lines if l.startswith("Zonenname:")), "Unknown")
-    zonenumber = next((l.split(":", 1)[1].strip() for l in lines if l.startswith("Zonennummer:")), "Unknown")
-    return {"attacker": fix_attacker_casing(attacker), "begin": begin, "zonename": zonename, "zonenumber": zonenumber}
-
-def format_message(user_id, msg):
-    config = user_configs.get(str(user_id), {})
-    message_format = config.get("message_format", DEFAULT_PRESET)
-    telegram_user = config.get("telegram_user", "???")
-    parsed = parse_turf_message(msg)
+    fields = {}
+    for match in TURF_REPORT_PATTERN.finditer(msg):
+        key = match.lastgroup
+        if key not in fields: fields[key] = match.group(key) # The first matching line wins
+    attacker = fields["attacker"].split(" ver", 1)[0].strip() if "attacker" in fields else "Unknown"
+    begin_tokens = fields.get("begin", "").split()
+    return TurfReport(attacker=fix_attacker_casing(attacker),
+                      begin=begin_tokens[-1][:5] if begin_tokens else "??:??",
+                      zonename=fields["zonename"].strip() if "zonename" in fields else "Unknown",
+                      zonenumber=fields["zonenumber"].strip() if "zonenumber" in fields else "Unknown")
+
+TURF_TEMPLATE_FIELDS = frozenset(("telegram_user", *TurfReport._fields))
+
+def normalize_user_text(text: str) -> str:
+    # Slash command inputs cannot contain line breaks, so users type a literal \n instead
+    return text.replace("\\n", "\n")
+
+def compile_turf_template(text: str) -> str:
+    """Normalizes a report template and checks it renders; raises ValueError with a readable reason otherwise."""
+    text = normalize_user_text(text)
+    try:
+        fields = [field for _, field, _, _ in Formatter().parse(text) if field is not None]
+    except ValueError as e:
+        raise ValueError(f"malformed braces ({e})") from None
+    if unknown := sorted({field or "{}" for field in fields} - TURF_TEMPLATE_FIELDS):
+        raise ValueError(f"unknown placeholder(s) {', '.join(unknown)}; allowed: {', '.join(sorted(TURF_TEMPLATE_FIELDS))}")
+    try:
+        text.format(**dict.fromkeys(TURF_TEMPLATE_FIELDS, ""))
+    except (ValueError, KeyError, IndexError, AttributeError) as e:
+        raise ValueError(str(e)) from None
+    return text
+
+class CompiledTurfFormat(NamedTuple):
+    intro: str
+    report_template: str # Intro and report format joined, so forwarding a report is one str.format call
+    telegram_user: str
+
+compiled_turf_formats: dict[str, CompiledTurfFormat] = {}
+
+def invalidate_turf_format(user_id: str):
+    compiled_turf_formats.pop(user_id, None)
+
+def compiled_turf_format(user_id: str) -> CompiledTurfFormat:
+    if (compiled := compiled_turf_formats.get(user_id)) is not None:
+        return compiled
+    config = user_configs.get(user_id, {})
     intro = config.get("custom_intro", DEFAULT_MESSAGE_PREFIX)
-    if parsed:
-        try:
-            return f"{intro}\n" + message_format.format(telegram_user=telegram_user, **parsed).replace("\\n", "\n")
-        except KeyError:
-            return f"{intro}\n" + DEFAULT_PRESET.format(**parsed)
-    return f"{intro}\n{telegram_user}: {msg}"
+    try:
+        template = compile_turf_template(config.get("message_format", DEFAULT_PRESET))
+    except ValueError as e:
+        # Only formats stored before templates were validated on save can land here
+        print(f"[Telegram] Stored message format of user {user_id} is unusable ({e}), using the default preset.")
+        template = DEFAULT_PRESET
+    escaped_intro = intro.replace("{", "{{").replace("}", "}}")
+    compiled = compiled_turf_formats[user_id] = CompiledTurfFormat(intro, f"{escaped_intro}\n{template}", config.get("telegram_user", "???"))
+    return compiled
+
+def format_message(user_id, msg, report: TurfReport | None):
+    compiled = compiled_turf_format(str(user_id))
+    if report:
+        return compiled.report_template.format(telegram_user=compiled.telegram_user, **report._asdict())
+    return f"{compiled.intro}\n{compiled.telegram_user}: {msg}"
 
 def fix_attacker_casing(name):
     parts = name.split()
     preserved = {"mc", "e.v.", "ev", "gmbh", "ag"}
     return ' '.join(part if part.lower() in preserved else part.capitalize() for part in parts)
 
+class WebhookDispatchQueue:
+    """Posts to one webhook strictly in order, retrying rate-limited or failed posts with backoff,
+    merging bursts of small messages into one post and shedding load once the queue is full."""
+    def __init__(self, bot_instance: MyBot, webhook_url: str, max_size: int = WEBHOOK_QUEUE_MAX_SIZE, overflow: str = WEBHOOK_QUEUE_OVERFLOW,
+                 merge_window: float = WEBHOOK_MERGE_WINDOW, retries: int = WEBHOOK_SEND_RETRIES, backoff: float = WEBHOOK_RETRY_BACKOFF):
+        if overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown webhook queue overflow policy '{overflow}'.")
+        self.bot = bot_instance
+        self.webhook_url = webhook_url
+        self.max_size = max_size
+        self.overflow = overflow
+        self.merge_window = merge_window
+        self.retries = retries
+        self.backoff = backoff
+        self._queue: deque[tuple[float, str, str | None]] = deque() # (queued_at, content, username)
+        self._task: asyncio.Task | None = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.enqueued = 0
+        self.posts = 0
+        self.merged = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retried = 0
+        self.peak_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def put(self, content: str, username: str | None = None) -> bool:
+        """Queues a message without waiting for it to be sent. Returns False if the overflow policy rejected it."""
+        if len(self._queue) >= self.max_size:
+            self.dropped += 1
+            if self.overflow == "drop_newest": return False
+            self._queue.popleft()
+        self._queue.append((time.monotonic(), content, username))
+        self.enqueued += 1
+        self.peak_depth = max(self.peak_depth, len(self._queue))
+        self._idle.clear()
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return True
+
+    def _next_post(self) -> tuple[str, str | None]:
+        # Messages that piled up while an earlier post was in flight or rate limited go out together
+        first_queued_at, content, username = self._queue.popleft()
+        while self._queue:
+            queued_at, next_content, next_username = self._queue[0]
+            if next_username != username or queued_at - first_queued_at > self.merge_window or len(content) + 1 + len(next_content) > DISCORD_MESSAGE_LIMIT:
+                break
+            self._queue.popleft()
+            content = f"{content}\n{next_content}"
+            self.merged += 1
+        return content, username
+
+    async def _run(self):
+        try:
+            while self._queue:
+                await self._send(*self._next_post())
+        finally:
+            self._idle.set()
+
+    async def _send(self, content: str, username: str | None):
+        # discord.py already waits out rate limits it sees in the response headers; this covers what it gives up on
+        for attempt in range(self.retries + 1):
+            retry_after = 0.0
+            try:
+                await self.bot.get_webhook(self.webhook_url).send(content, username=username)
+                self.posts += 1
+                return
+            except discord.HTTPException as e:
+                error = e
+                if e.status != 429 and e.status < 500: break # Rejected outright, e.g. a deleted webhook; retrying cannot help
+                if e.response is not None:
+                    retry_after = float(e.response.headers.get("Retry-After", 0))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            except Exception as e:
+                error = e
+                break
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(max(retry_after, self.backoff * 2 ** attempt))
+        self.failed += 1
+        print(f"[WebhookQueue] Dropped a post after {attempt + 1} attempt(s): {error}")
+
+    async def drain(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            print(f"[WebhookQueue] {self.depth} post(s) still queued at shutdown.")
+
+    def close(self):
+        self._queue.clear()
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    def __str__(self):
+        return (f"depth {self.depth}/{self.max_size} (peak {self.peak_depth}), posts {self.posts}, merged {self.merged}, "
+                f"retried {self.retried}, dropped {self.dropped}, failed {self.failed}")
+
+class TelegramForwardStats:
+    """Per-client counters: messages from the filtered sender, those forwarded to Discord, and other senders' messages
+    the username fallback had to drop itself. Once the sender's peer ID is known Telethon drops those before any
+    handler runs, so they are no longer seen or counted."""
+    __slots__ = ("matched", "filtered", "forwarded")
+
+    def __init__(self):
+        self.matched = 0
+        self.filtered = 0
+        self.forwarded = 0
+
+    @property
+    def seen(self) -> int:
+        return self.matched + self.filtered
+
+    def __str__(self):
+        return f"seen {self.seen}, filtered {self.filtered}, forwarded {self.forwarded}"
+
+async def keep_sender_filter_fresh(client: TelegramClient, user_id: str, username: str, handler, webhook_url: str):
+    """Resolves the filtered username to a peer ID and re-binds the handler whenever that ID changes,
+    so Telethon drops other senders' messages before the handler is ever called. Runs until cancelled."""
+    async def match_username(event):
+        # Until the first lookup succeeds, senders are matched by username as before, so nothing is missed
+        sender = await event.get_sender()
+        if sender and getattr(sender, "username", None) == username:
+            await handler(event)
+        else:
+            bot.telegram_stats[user_id].filtered += 1
+
+    client.add_event_handler(match_username, events.NewMessage(incoming=True))
+    peer_id = None
+    while True:
+        try:
+            # get_entity always asks Telegram for usernames, so a username that moved to another account is noticed
+            new_peer_id = await client.get_peer_id(await client.get_entity(username))
+        except Exception as e:
+            print(f"[Telegram] Could not resolve '{username}' for user {user_id}: {e}")
+            new_peer_id = peer_id
+        if new_peer_id != peer_id:
+            client.remove_event_handler(match_username)
+            client.remove_event_handler(handler)
+            client.add_event_handler(handler, events.NewMessage(incoming=True, from_users=new_peer_id))
+            peer_id = new_peer_id
+        print(f"[Telegram] User {user_id} ({username} -> {peer_id}): {bot.telegram_stats[user_id]}; queue {bot.get_webhook_queue(webhook_url)}")
+        await asyncio.sleep(TELEGRAM_FILTER_REFRESH_INTERVAL if peer_id else TELEGRAM_FILTER_RETRY_INTERVAL)
+
 async def start_telegram_client(user_id: str, user: User | Member | None, is_interactive_setup: bool = False):
     config = user_configs.get(user_id)
     if not config:
@@ -979,26 +2289,30 @@ async def start_telegram_client(user_id: str, user: User | Member | None, is_int
             if client.is_connected(): await client.disconnect()
             return
 
-    @client.on(events.NewMessage(incoming=True))
+    stats = bot.telegram_stats.setdefault(user_id, TelegramForwardStats())
+
+    # Registered by keep_sender_filter_fresh, by username until the filtered username has been resolved to a peer ID
     async def handler(event):
-        sender = await event.get_sender()
-        if sender and hasattr(sender, 'username') and sender.username == telegram_user_filter:
-            async with aiohttp.ClientSession() as session:
-                try:
-                    webhook = Webhook.from_url(webhook_url, session=session)
-                    await webhook.send(format_message(user_id, event.raw_text), username=f"Telegram ({telegram_user_filter})")
-                    if "Auf eure Organisation" in event.raw_text:
-                        await asyncio.sleep(AUTO_LIST_POST_DELAY)
-                        target_gid = user_configs.get(user_id, {}).get("guild_id")
-                        if target_gid and (target_guild := bot.get_guild(target_gid)) and (turf_chan_id_str := turf_config.get(str(target_gid))):
-                           if (target_channel := bot.get_channel(int(turf_chan_id_str))) and isinstance(target_channel, TextChannel):
-                                await list_manager.start_new_list_programmatic(target_guild, target_channel)
-                except Exception as e:
-                    print(f"[Telegram] Failed to forward message for user {user_id}: {e}")
+        stats.matched += 1
+        try:
+            # Parsed once; the forwarded text and the auto-list trigger share the result
+            report = parse_turf_message(event.raw_text)
+            if bot.get_webhook_queue(webhook_url).put(format_message(user_id, event.raw_text, report), username=f"Telegram ({telegram_user_filter})"):
+                stats.forwarded += 1
+            if report:
+                await asyncio.sleep(AUTO_LIST_POST_DELAY)
+                target_gid = user_configs.get(user_id, {}).get("guild_id")
+                if target_gid and (target_guild := bot.get_guild(target_gid)) and (turf_chan_id_str := turf_config.get(str(target_gid))):
+                   if (target_channel := bot.get_channel(int(turf_chan_id_str))) and isinstance(target_channel, TextChannel):
+                        await list_manager.start_new_list_programmatic(target_guild, target_channel)
+        except Exception as e:
+            print(f"[Telegram] Failed to forward message for user {user_id}: {e}")
 
     try:
         await client.start()
         bot.telegram_clients[user_id] = client
+        if (old_task := bot.telegram_filter_tasks.get(user_id)) and not old_task.done(): old_task.cancel()
+        bot.telegram_filter_tasks[user_id] = asyncio.create_task(keep_sender_filter_fresh(client, user_id, telegram_user_filter, handler, webhook_url))
         if is_interactive_setup and user:
             await user.send(localizer.get_string(None, "tg_connect_final_success"))
     except Exception as e:
@@ -1016,9 +2330,7 @@ async def daily_telegram_notice():
         for user_id_str, config in user_configs.items():
             if webhook_url := config.get("webhook_url"):
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        webhook = Webhook.from_url(webhook_url, session=session)
-                        await webhook.send("🔁 The bot restarts every 30 minutes. The Telegram webhook is reactivated on every restart.")
+                    bot.get_webhook_queue(webhook_url).put("🔁 The bot restarts every 30 minutes. The Telegram webhook is reactivated on every restart.")
                 except Exception as e:
                     print(f"[TelegramNotice] Error for user {user_id_str}: {e}")
 
@@ -1026,13 +2338,11 @@ async def auto_restart_timer():
     await bot.wait_until_ready()
     await asyncio.sleep(1800) # 30 minutes
     print("🔁 [AutoRestart] Timer expired. Initiating restart...")
-    # FIX: Use string keys consistently
-    save_json_file(bot.reminder_messages, REMINDER_MESSAGES_FILE)
-    permissions_manager.save_permissions()
-    list_manager.save_lists_data()
+    await persistence.close()
     for client in bot.telegram_clients.values():
         if client.is_connected():
             await client.disconnect()
+    await bot.drain_webhook_queues()
     os.execv(sys.executable, ['python'] + sys.argv)
 
 @bot.tree.command(name="access", description="Manage command permissions for roles and members.")
@@ -1106,12 +2416,7 @@ async def kick_command(interaction: Interaction, member: Member, reason: str = "
         await interaction.response.send_message(localizer.get_string(gid, "kick_perm_fail"), ephemeral=True); return
     
     await interaction.response.defer(ephemeral=True)
-    invite_link = None
-    if isinstance(interaction.channel, (TextChannel, VoiceChannel, discord.Thread)):
-        try:
-            invite = await interaction.channel.create_invite(max_age=3600, max_uses=1, reason=f"Invite for kicked user {member.display_name}")
-            invite_link = invite.url
-        except Exception as e: print(f"[Kick] Could not create invite: {e}")
+    invite_link = await invite_pool.acquire(interaction.guild, reason=f"Invite for kicked user {member.display_name}")
     
     dm_sent = False
     if invite_link:
@@ -1166,80 +2471,150 @@ async def unban_command(interaction: Interaction, reason: str = "Manually unbann
     view = UnbanSelectView(ban_manager, bot, banned_users, reason, interaction)
     await interaction.followup.send(localizer.get_string(gid, "unban_select_user_prompt"), view=view, ephemeral=True)
 
+async def list_autocomplete(interaction: Interaction, current: str) -> list[app_commands.Choice[str]]:
+    if not interaction.guild: return []
+    choices = []
+    for list_id in list_manager.guild_list_ids(interaction.guild.id):
+        list_data = list_manager.lists_data[list_id]
+        channel = interaction.guild.get_channel(list_data["channel_id"]) if list_data["channel_id"] else None
+        state = "locked" if list_data.get("locked", False) else "open" if list_data["message_id"] else "not posted"
+        name = f"#{channel.name if channel else '?'} · {len(list_data['main'])}/{list_data['max_slots']} · {state} · {list_id}"
+        if current.lower() in name.lower():
+            choices.append(app_commands.Choice(name=name[:100], value=list_id))
+        if len(choices) == 25: break
+    return choices
+
 @bot.tree.command(name="list_start", description="Starts a new interactive participation list in this channel.")
+@app_commands.describe(slots=f"Main list slots (default {MAX_MAIN_LIST_SLOTS})", list_id="Re-post an existing list here instead of starting a new one")
+@app_commands.rename(list_id="list")
+@app_commands.autocomplete(list_id=list_autocomplete)
 @check_permissions()
-async def list_start_command(interaction: Interaction):
+async def list_start_command(interaction: Interaction, slots: Optional[app_commands.Range[int, 1, 100]] = None, list_id: str | None = None):
     if not interaction.guild or not isinstance(interaction.channel, TextChannel): return
     gid = interaction.guild.id
-    guild_data = list_manager._get_guild_list_data(gid)
-    if guild_data.get("message_id") and not guild_data.get("locked", False):
-        if (old_channel := interaction.guild.get_channel(guild_data["channel_id"])):
-            try:
-                await old_channel.fetch_message(guild_data["message_id"])
-                await interaction.response.send_message(localizer.get_string(gid, "list_err_already_active", channel=old_channel.mention), ephemeral=True)
-                return
-            except discord.NotFound: pass
-            
+    if list_id is not None:
+        list_id, list_data = list_manager.resolve_list(gid, list_id)
+        if not list_data:
+            await interaction.response.send_message(localizer.get_string(gid, "list_err_unknown_list"), ephemeral=True); return
+        if list_data.get("message_id") and not list_data.get("locked", False):
+            if (old_channel := interaction.guild.get_channel(list_data["channel_id"])):
+                try:
+                    await old_channel.fetch_message(list_data["message_id"])
+                    await interaction.response.send_message(localizer.get_string(gid, "list_err_already_active", channel=old_channel.mention), ephemeral=True)
+                    return
+                except discord.NotFound: pass
+        await list_manager.reset_list(interaction.guild, list_id, slots)
+        created = False
+    else:
+        list_id, _ = list_manager.create_list(gid, slots or MAX_MAIN_LIST_SLOTS)
+        created = True
+
     await interaction.response.defer(ephemeral=True)
-    await list_manager._ensure_role(interaction.guild, ROLE_LIST_IN_NAME)
-    await list_manager._ensure_role(interaction.guild, ROLE_LIST_RESERVE_NAME)
-    guild_data.update({"main": [], "reserve": [], "locked": False})
-    
-    view = PersistentListView(list_manager, gid)
     try:
-        list_message = await interaction.channel.send(content=list_manager.generate_list_content_string(interaction.guild), view=view)
-        guild_data.update({"channel_id": interaction.channel.id, "message_id": list_message.id})
-        list_manager.save_lists_data()
+        await list_manager.post_list(interaction.guild, interaction.channel, list_id)
         await interaction.followup.send(localizer.get_string(gid, "list_created_success"), ephemeral=True)
     except Exception as e:
+        if created: list_manager.discard_list(list_id)
         await interaction.followup.send(localizer.get_string(gid, "list_created_fail", error=e), ephemeral=True)
 
 @bot.tree.command(name="list_lock", description="Locks the active list, removing buttons and roles.")
+@app_commands.describe(list_id="The list to lock (defaults to the newest open list)")
+@app_commands.rename(list_id="list")
+@app_commands.autocomplete(list_id=list_autocomplete)
 @check_permissions()
-async def list_lock_command(interaction: Interaction):
+async def list_lock_command(interaction: Interaction, list_id: str | None = None):
     if not interaction.guild: return
     gid = interaction.guild.id
-    guild_data = list_manager._get_guild_list_data(gid)
-    if guild_data.get("locked", False):
-        await interaction.response.send_message(localizer.get_string(gid, "list_err_already_locked"), ephemeral=True); return
-    if not guild_data.get("message_id"):
+    list_id, list_data = list_manager.resolve_list(gid, list_id)
+    if not list_data or not list_data.get("message_id"):
         await interaction.response.send_message(localizer.get_string(gid, "list_err_no_list_found"), ephemeral=True); return
+    if list_data.get("locked", False):
+        await interaction.response.send_message(localizer.get_string(gid, "list_err_already_locked"), ephemeral=True); return
         
     await interaction.response.defer(ephemeral=True)
-    if (channel := interaction.guild.get_channel(guild_data["channel_id"])) and isinstance(channel, TextChannel):
+    if (channel := interaction.guild.get_channel(list_data["channel_id"])) and isinstance(channel, TextChannel):
         try:
-            message = await channel.fetch_message(guild_data["message_id"])
-            guild_data["locked"] = True
-            await message.edit(content=list_manager.generate_list_content_string(interaction.guild), view=None)
+            message = await channel.fetch_message(list_data["message_id"])
+            list_data["locked"] = True
+            content = list_manager.generate_list_content_string(interaction.guild, list_id)
+            await message.edit(content=content, view=None)
+            list_manager.mark_posted(list_id, message.id, content)
         except Exception as e: print(f"Error editing list message on lock: {e}")
         
     feedback = []
-    for role_name in [ROLE_LIST_IN_NAME, ROLE_LIST_RESERVE_NAME]:
-        if (role := discord.utils.get(interaction.guild.roles, name=role_name)):
+    for role_name in list_data["roles"].values():
+        if (role := list_manager._cached_role(interaction.guild, role_name)):
             try:
                 await role.delete(reason="List locked")
                 feedback.append(localizer.get_string(gid, "list_role_deleted", role=role_name))
             except Exception as e:
                 feedback.append(localizer.get_string(gid, "list_role_delete_fail", role=role_name, error=e))
 
-    guild_data.update({"locked": True, "main": [], "reserve": []})
-    list_manager.save_lists_data()
+    # The roles are recreated on demand by the next list start or join
+    list_manager.invalidate_list_roles(gid)
+    await list_manager.archive_list(list_id, "locked")
     final_msg = localizer.get_string(gid, "list_locked_success")
     if feedback: final_msg += "\n" + "\n".join(feedback)
     await interaction.followup.send(final_msg, ephemeral=True)
 
 @bot.tree.command(name="list_refresh", description="Manually refreshes the display of the participation list.")
+@app_commands.describe(list_id="The list to refresh (defaults to the newest open list)")
+@app_commands.rename(list_id="list")
+@app_commands.autocomplete(list_id=list_autocomplete)
 @check_permissions()
-async def list_refresh_command(interaction: Interaction):
+async def list_refresh_command(interaction: Interaction, list_id: str | None = None):
     if not interaction.guild: return
     gid = interaction.guild.id
-    if not list_manager._get_guild_list_data(gid).get("message_id"):
+    list_id, list_data = list_manager.resolve_list(gid, list_id)
+    if not list_data or not list_data.get("message_id"):
         await interaction.response.send_message(localizer.get_string(gid, "list_err_no_list_found"), ephemeral=True); return
     
     await interaction.response.defer(ephemeral=True)
-    await list_manager.update_list_message(gid, interaction=interaction)
+    # A manual refresh always re-resolves every member and re-posts, even if nothing seems to have changed
+    list_manager.reset_render_cache(gid, list_id)
+    await list_manager.update_list_message(list_id, interaction=interaction)
     await interaction.followup.send(localizer.get_string(gid, "list_refreshed"), ephemeral=True)
 
+class ListHistoryView(ui.View):
+    def __init__(self, guild_id: int, page: int, has_more: bool):
+        super().__init__(timeout=180)
+        self.guild_id = guild_id
+        self.page = page
+
+        self.prev_button = ui.Button(emoji="◀️", style=ButtonStyle.secondary, disabled=page == 0)
+        self.next_button = ui.Button(emoji="▶️", style=ButtonStyle.secondary, disabled=not has_more)
+        self.prev_button.callback = self.prev_button_callback
+        self.next_button.callback = self.next_button_callback
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+
+    async def prev_button_callback(self, interaction: Interaction):
+        embed, view = await build_list_history_page(self.guild_id, self.page - 1)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+    async def next_button_callback(self, interaction: Interaction):
+        embed, view = await build_list_history_page(self.guild_id, self.page + 1)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+async def build_list_history_page(guild_id: int, page: int) -> tuple[Embed, ListHistoryView]:
+    # Decompressing segments is blocking file work, so it stays off the event loop
+    entries, has_more = await asyncio.get_running_loop().run_in_executor(None, list_manager.archive.read_page, guild_id, page, LIST_HISTORY_PAGE_SIZE)
+    lines = [localizer.get_string(guild_id, "list_history_entry", closed=e["closed_at"], channel=f"<#{e['channel_id']}>" if e.get("channel_id") else "-",
+                                  main=len(e["main"]), max=e["max_slots"], reserve=len(e["reserve"]),
+                                  reason=localizer.get_string(guild_id, f"list_history_reason_{e['reason']}")) for e in entries]
+    embed = Embed(title=localizer.get_string(guild_id, "list_history_title"),
+                  description="\n".join(lines) or localizer.get_string(guild_id, "list_history_empty"), color=Color.blurple())
+    embed.set_footer(text=localizer.get_string(guild_id, "list_history_page", page=page + 1))
+    return embed, ListHistoryView(guild_id, page, has_more)
+
+@bot.tree.command(name="list_history", description="Shows the archived participation lists of this server.")
+@check_permissions()
+async def list_history_command(interaction: Interaction):
+    if not interaction.guild: return
+    await interaction.response.defer(ephemeral=True)
+    embed, view = await build_list_history_page(interaction.guild.id, 0)
+    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+
 @bot.tree.command(name="move", description="Move a user between two voice channels repeatedly.")
 @app_commands.describe(member="User to move", talk1="First VC", talk2="Second VC", delay="Seconds between moves")
 @check_permissions()
@@ -1274,6 +2649,95 @@ async def move(interaction: Interaction, member: Member, talk1: VoiceChannel, ta
     bot.moving_tasks[task_key] = task
     await interaction.response.send_message(localizer.get_string(gid, "move_started", user=member.display_name), ephemeral=False)
 
+class VoiceMoveDispatcher:
+    """Moves many members into a voice channel at once, capped per guild and retrying moves that hit a rate limit."""
+    def __init__(self, concurrency: int, retries: int, backoff: float):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self._limits: dict[int, asyncio.Semaphore] = {}
+
+    async def _move(self, member: Member, channel: VoiceChannel, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    await member.move_to(channel, reason="List move")
+                    return True
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == self.retries: return False
+                    retry_after = float(e.response.headers.get("Retry-After", 0)) if e.response is not None else 0
+                    await asyncio.sleep(max(retry_after, self.backoff * 2 ** attempt))
+        return False
+
+    async def move_all(self, members: list[Member], channel: VoiceChannel, on_progress: Callable[[int], Awaitable[None]] | None = None) -> tuple[list[Member], list[Member]]:
+        """Returns the members that were moved and those that could not be."""
+        # One semaphore per guild: concurrent commands in the same guild share the cap and its rate limit bucket
+        semaphore = self._limits.setdefault(channel.guild.id, asyncio.Semaphore(self.concurrency))
+        moved, failed = [], []
+        tasks = {asyncio.create_task(self._move(member, channel, semaphore)): member for member in members}
+        pending = set(tasks)
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    (moved if task.exception() is None and task.result() else failed).append(tasks[task])
+                if not on_progress: continue
+                try:
+                    await on_progress(len(moved) + len(failed))
+                except Exception as e:
+                    # A lost progress message must not abandon the moves still running
+                    print(f"[VoiceMove] Progress update failed: {e}")
+        finally:
+            # If the command itself is cancelled, no move keeps running unobserved in the background
+            for task in pending: task.cancel()
+            if pending: await asyncio.gather(*pending, return_exceptions=True)
+        return moved, failed
+
+voice_dispatcher = VoiceMoveDispatcher(VOICE_MOVE_CONCURRENCY, VOICE_MOVE_RETRIES, VOICE_MOVE_BACKOFF)
+
+@bot.tree.command(name="list_move_all", description="Moves everyone on the main list who is in voice into a voice channel.")
+@app_commands.describe(voice_channel="Target voice channel (defaults to your current one)", list_id="The list to move (defaults to the newest open list)")
+@app_commands.rename(list_id="list")
+@app_commands.autocomplete(list_id=list_autocomplete)
+@check_permissions()
+async def list_move_all_command(interaction: Interaction, voice_channel: VoiceChannel | None = None, list_id: str | None = None):
+    if not interaction.guild or not isinstance(interaction.user, Member): return
+    gid = interaction.guild.id
+    if not interaction.guild.me.guild_permissions.move_members:
+        await interaction.response.send_message(localizer.get_string(gid, "list_move_no_permission"), ephemeral=True); return
+    list_id, list_data = list_manager.resolve_list(gid, list_id)
+    if not list_data:
+        await interaction.response.send_message(localizer.get_string(gid, "list_err_no_list_found"), ephemeral=True); return
+    if voice_channel is None and interaction.user.voice and isinstance(interaction.user.voice.channel, VoiceChannel):
+        voice_channel = interaction.user.voice.channel
+    if voice_channel is None:
+        await interaction.response.send_message(localizer.get_string(gid, "list_move_no_channel"), ephemeral=True); return
+
+    # Members who are not connected cannot be moved; they are reported right away instead of waited for
+    to_move, not_in_voice = [], []
+    for user_id in list_data["main"]:
+        member = interaction.guild.get_member(user_id)
+        if member and member.voice and member.voice.channel:
+            if member.voice.channel.id != voice_channel.id: to_move.append(member)
+        else:
+            not_in_voice.append(member.mention if member else f"ID: {user_id}")
+    total = len(to_move)
+
+    await interaction.response.send_message(localizer.get_string(gid, "list_move_started", total=total, channel=voice_channel.mention), ephemeral=True)
+    last_edit = time.monotonic()
+    async def report_progress(done: int):
+        nonlocal last_edit
+        # At most one progress edit per second; the summary below always shows the final state
+        if done < total and time.monotonic() - last_edit >= 1:
+            last_edit = time.monotonic()
+            await interaction.edit_original_response(content=localizer.get_string(gid, "list_move_progress", done=done, total=total, channel=voice_channel.mention))
+    moved, failed = await voice_dispatcher.move_all(to_move, voice_channel, report_progress)
+
+    summary = [localizer.get_string(gid, "list_move_summary", moved=len(moved), total=total, channel=voice_channel.mention)]
+    if failed: summary.append(localizer.get_string(gid, "list_move_failed", users=", ".join(m.mention for m in failed)))
+    if not_in_voice: summary.append(localizer.get_string(gid, "list_move_not_in_voice", users=", ".join(not_in_voice)))
+    await interaction.edit_original_response(content="\n".join(summary)[:2000])
+
 @bot.tree.command(name="stopmove", description="Stop moving a user.")
 @app_commands.describe(member="The user to stop moving")
 @check_permissions()
@@ -1306,7 +2770,7 @@ async def reminder_edit(interaction: Interaction, message: str):
     if not interaction.guild: return
     gid = interaction.guild.id
     bot.reminder_messages[str(gid)] = message
-    save_json_file(bot.reminder_messages, REMINDER_MESSAGES_FILE)
+    persistence.schedule_save(REMINDER_MESSAGES_FILE, bot.reminder_messages, key=str(gid))
     await interaction.response.send_message(localizer.get_string(gid, 'reminder_edit_success'), ephemeral=False)
 
 @bot.tree.command(name="message_role", description="Send a direct message to all users with a specific role.")
@@ -1373,16 +2837,52 @@ class RoleMessageLangStrings:
         }
 
 def add_role_message_lang_strings(localizer: LocalizationManager):
-    for lang_code in localizer._locales:
-        localizer._locales[lang_code].update(RoleMessageLangStrings().get_strings())
+    localizer.register_defaults(RoleMessageLangStrings().get_strings())
 
 add_role_message_lang_strings(localizer)
 
+class PersistentListLangStrings:
+    def get_strings(self):
+        return {
+            "list_err_unknown_list": "That list does not exist on this server.",
+            "list_history_title": "Archived lists",
+            "list_history_empty": "No lists have been archived on this server yet.",
+            "list_history_entry": "<t:{closed}:f> · {channel} · {main}/{max} main, {reserve} reserve · {reason}",
+            "list_history_page": "Page {page}",
+            "list_history_reason_locked": "locked",
+            "list_history_reason_replaced": "replaced",
+            "list_history_reason_deleted": "message deleted",
+            "list_move_no_permission": "I need the Move Members permission for this.",
+            "list_move_no_channel": "Pick a voice channel or join one first.",
+            "list_move_started": "Moving {total} members to {channel}...",
+            "list_move_progress": "Moving members to {channel}: {done}/{total}",
+            "list_move_summary": "Moved {moved}/{total} members to {channel}.",
+            "list_move_failed": "Could not move: {users}",
+            "list_move_not_in_voice": "Not in voice: {users}",
+        }
+
+def add_persistent_list_lang_strings(localizer: LocalizationManager):
+    localizer.register_defaults(PersistentListLangStrings().get_strings())
+
+add_persistent_list_lang_strings(localizer)
+
+class TelegramTemplateLangStrings:
+    def get_strings(self):
+        return {
+            "tg_template_invalid": "That message format can't be used: {error}",
+        }
+
+def add_telegram_template_lang_strings(localizer: LocalizationManager):
+    localizer.register_defaults(TelegramTemplateLangStrings().get_strings())
+
+add_telegram_template_lang_strings(localizer)
+
 @check_permissions()
 async def telegram_customize_message(interaction: Interaction, message: str):
     user_id = str(interaction.user.id)
-    user_configs.setdefault(user_id, {})["custom_intro"] = message
-    save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+    user_configs.setdefault(user_id, {})["custom_intro"] = normalize_user_text(message)
+    invalidate_turf_format(user_id)
+    persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=user_id)
     await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_custom_intro_updated"), ephemeral=True)
 
 @bot.tree.command(name="turf_edit_default_preset_message", description="Set the default intro line (e.g. before telegram war output).")
@@ -1390,8 +2890,9 @@ async def telegram_customize_message(interaction: Interaction, message: str):
 @check_permissions()
 async def turf_edit_default_preset_message(interaction: discord.Interaction, message: str):
     user_id = str(interaction.user.id)
-    user_configs.setdefault(user_id, {})["custom_intro"] = message
-    save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+    user_configs.setdefault(user_id, {})["custom_intro"] = normalize_user_text(message)
+    invalidate_turf_format(user_id)
+    persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=user_id)
     await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_custom_intro_updated"), ephemeral=True)
 
 @bot.tree.command(name="telegram_save_preset", description="Save a message formatting preset.")
@@ -1399,9 +2900,12 @@ async def turf_edit_default_preset_message(interaction: discord.Interaction, mes
 @check_permissions()
 async def telegram_save_preset(interaction: Interaction, preset_name: str):
     user_id = str(interaction.user.id)
-    msg_format = user_configs.get(user_id, {}).get("message_format", DEFAULT_PRESET)
+    try:
+        msg_format = compile_turf_template(user_configs.get(user_id, {}).get("message_format", DEFAULT_PRESET))
+    except ValueError as e:
+        await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_template_invalid", error=e), ephemeral=True); return
     turf_presets.setdefault(user_id, {})[preset_name] = msg_format
-    save_json_file(turf_presets, PRESET_FILE)
+    persistence.schedule_save(PRESET_FILE, turf_presets, key=user_id)
     await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_preset_saved", name=preset_name), ephemeral=True)
 
 class PresetSelect(discord.ui.Select):
@@ -1415,8 +2919,13 @@ class PresetSelect(discord.ui.Select):
     async def callback(self, interaction: Interaction):
         chosen_preset_name = self.values[0]
         if preset_content := self.presets_map.get(chosen_preset_name):
+            try:
+                preset_content = compile_turf_template(preset_content)
+            except ValueError as e:
+                await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_template_invalid", error=e), ephemeral=True); return
             user_configs.setdefault(self.user_id_str, {})["message_format"] = preset_content
-            save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+            invalidate_turf_format(self.user_id_str)
+            persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=self.user_id_str)
             await interaction.response.send_message(localizer.get_string(interaction.guild_id, "tg_preset_loaded", name=chosen_preset_name), ephemeral=True)
             if self.view: self.view.stop()
             if interaction.message:
@@ -1446,6 +2955,9 @@ async def telegram_user_files_clear(interaction: Interaction):
     user_id_str = str(interaction.user.id)
     summary = [f"**{localizer.get_string(None, 'tg_clear_title', user=interaction.user.mention)}**"]
     
+    if task := bot.telegram_filter_tasks.pop(user_id_str, None):
+        task.cancel()
+    bot.telegram_stats.pop(user_id_str, None)
     if client := bot.telegram_clients.pop(user_id_str, None):
         if client.is_connected(): await client.disconnect()
         summary.append(localizer.get_string(None, 'tg_clear_disconnect_success'))
@@ -1454,21 +2966,21 @@ async def telegram_user_files_clear(interaction: Interaction):
         
     if (user_conf := user_configs.get(user_id_str)) and (webhook_url := user_conf.get("webhook_url")):
         try:
-            async with aiohttp.ClientSession() as session:
-                webhook = Webhook.from_url(webhook_url, session=session)
-                await webhook.delete()
-                summary.append(localizer.get_string(None, 'tg_clear_webhook_deleted'))
+            await bot.get_webhook(webhook_url).delete()
+            summary.append(localizer.get_string(None, 'tg_clear_webhook_deleted'))
         except (discord.NotFound, ValueError):
             summary.append(localizer.get_string(None, 'tg_clear_webhook_gone'))
         except Exception as e:
             summary.append(localizer.get_string(None, 'tg_clear_webhook_fail', error=e))
+        bot.forget_webhook(webhook_url)
             
+    invalidate_turf_format(user_id_str)
     if user_configs.pop(user_id_str, None):
-        save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+        persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=user_id_str)
         summary.append(localizer.get_string(None, 'tg_clear_config_removed', file=TELEGRAM_CONFIG_FILE))
         
     if turf_presets.pop(user_id_str, None):
-        save_json_file(turf_presets, PRESET_FILE)
+        persistence.schedule_save(PRESET_FILE, turf_presets, key=user_id_str)
         summary.append(localizer.get_string(None, 'tg_clear_config_removed', file=PRESET_FILE))
         
     session_file = f"user_{user_id_str}.session"
@@ -1500,7 +3012,8 @@ async def telegram_set_channel(interaction: Interaction, channel: TextChannel):
     if user_id_str in user_configs and user_configs[user_id_str].get("webhook_url"):
         user_configs[user_id_str]["guild_id"] = gid
         user_configs[user_id_str]["channel_id"] = channel.id
-        save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+        invalidate_turf_format(user_id_str)
+        persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=user_id_str)
         try:
             await user.send(localizer.get_string(None, 'tg_setup_reconfigured', channel=channel.mention, guild_name=interaction.guild.name))
         except discord.Forbidden: pass
@@ -1526,7 +3039,8 @@ async def telegram_set_channel(interaction: Interaction, channel: TextChannel):
         user_configs[user_id_str] = {"api_id": api_id_msg.content.strip(), "api_hash": api_hash_msg.content.strip(),
                                      "telegram_user": telegram_user_msg.content.strip(), "webhook_url": webhook.url,
                                      "guild_id": gid, "channel_id": channel.id}
-        save_json_file(user_configs, TELEGRAM_CONFIG_FILE)
+        invalidate_turf_format(user_id_str)
+        persistence.schedule_save(TELEGRAM_CONFIG_FILE, user_configs, key=user_id_str)
         
         await user.send(localizer.get_string(None, 'tg_setup_dm_saved'))
         await start_telegram_client(user_id_str, user, is_interactive_setup=True)
@@ -1547,13 +3061,11 @@ async def restart_command(interaction: Interaction):
     
     await interaction.response.defer(ephemeral=False)
     
-    # FIX: Use string keys consistently
-    save_json_file(bot.reminder_messages, REMINDER_MESSAGES_FILE)
-    permissions_manager.save_permissions()
-    list_manager.save_lists_data()
+    await persistence.close()
     
     for client in bot.telegram_clients.values():
         if client.is_connected(): await client.disconnect()
+    await bot.drain_webhook_queues()
         
     restart_info = {"channel_id": interaction.channel_id}
     try:
@@ -1562,7 +3074,7 @@ async def restart_command(interaction: Interaction):
     except Exception as e:
         print(f"[Restart] Could not send restart message: {e}")
         
-    save_json_file(restart_info, "restart_info.json")
+    storage.write(RESTART_INFO_FILE, restart_info)
     os.execv(sys.executable, ['python'] + sys.argv)
 
 @bot.tree.error
@@ -1607,20 +3119,19 @@ async def on_ready():
         except Exception as e:
             print(f"Error starting Telegram client for user {user_id_str}: {e}")
             
-    if os.path.exists("restart_info.json"):
-        info = load_json_file("restart_info.json")
+    if info := storage.load(RESTART_INFO_FILE):
         if (channel_id := info.get("channel_id")) and (channel := bot.get_channel(channel_id)):
             if isinstance(channel, TextChannel) and (msg_id := info.get("message_id")):
                 try:
                     msg = await channel.fetch_message(msg_id)
                     await msg.edit(content="✅ Bot is back online!")
                 except discord.NotFound: pass
-        if os.path.exists("restart_info.json"):
-            os.remove("restart_info.json")
+        storage.clear(RESTART_INFO_FILE)
             
     print("[on_ready] Starting background tasks...")
     asyncio.create_task(daily_telegram_notice())
     asyncio.create_task(auto_restart_timer())
+    localizer.start_watching()
     print("[on_ready] All startup processes complete.")
     print("Logged in as Epic Bot")
 
@@ -1639,14 +3150,51 @@ async def on_guild_join(guild: discord.Guild):
         except discord.Forbidden:
             print(f"Could not send welcome message to {guild.name}")
 
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    permissions_manager.invalidate_index(role.guild.id)
+    list_manager.invalidate_list_roles(role.guild.id)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    permissions_manager.invalidate_index(role.guild.id)
+    list_manager.invalidate_list_roles(role.guild.id)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    if before.position != after.position:
+        permissions_manager.invalidate_index(after.guild.id)
+    if before.name != after.name:
+        list_manager.invalidate_list_roles(after.guild.id)
+
+@bot.event
+async def on_invite_delete(invite: discord.Invite):
+    if invite.guild:
+        invite_pool.discard(invite.guild.id, invite.code)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    invite_pool.invalidate_channel(channel.guild.id, channel.id)
+
+@bot.event
+async def on_member_remove(member: Member):
+    list_manager.invalidate_member_line(member.guild.id, member.id)
+
+@bot.event
+async def on_member_update(before: Member, after: Member):
+    # Also the first event for members that were not yet in the cache when their line was rendered
+    list_manager.invalidate_member_line(after.guild.id, after.id)
+
 @bot.event
 async def on_member_join(member: Member):
+    list_manager.invalidate_member_line(member.guild.id, member.id)
+    if member.guild.id not in ban_manager.bans_by_user.get(member.id, ()): return
     ban_key = (member.guild.id, member.id)
     if (ban_entry := ban_manager.active_bans.get(ban_key)) and ban_entry.get("status") == "unbanned_pending_roles":
         if roles_ids := ban_entry.get("roles_to_restore"):
             await ban_manager._restore_roles(member, roles_ids)
-        ban_manager.active_bans.pop(ban_key, None)
-        ban_manager.save_bans()
+        ban_manager.pop_ban(ban_key)
+        ban_manager.save_bans(ban_key)
         print(f"Restored roles for rejoining member {member.id} and cleared ban entry.")
 
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# bot.py loads and creates its state files relative to the working directory on import,
+# so the tests run it inside a scratch directory instead of the checkout.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix="epic-bot-tests-"))
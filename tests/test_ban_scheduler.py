@@ -0,0 +1,82 @@
+import asyncio
+import random
+import time
+import tracemalloc
+
+import bot
+
+BAN_COUNT = 10_000
+
+
+def test_ten_thousand_bans_expire_once_from_one_timer():
+    rng = random.Random(6)
+    expired = []
+
+    async def on_expire(guild_id, user_id):
+        expired.append((guild_id, user_id))
+
+    async def scenario():
+        scheduler = bot.BanScheduler(on_expire, bot.BAN_EXPIRY_WORKERS)
+        now = time.time()
+        keys = [(rng.randrange(1, 50), user_id) for user_id in range(BAN_COUNT)]
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for key in keys:
+            scheduler.schedule(key, now + rng.uniform(0.2, 0.8))
+        memory = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+
+        cancelled = set(rng.sample(keys, 1000))
+        for key in cancelled:
+            scheduler.cancel(key)
+        # Manual unban followed by a new ban: only the newest deadline may fire
+        rescheduled = rng.sample([k for k in keys if k not in cancelled], 500)
+        for key in rescheduled:
+            scheduler.schedule(key, now + rng.uniform(0.9, 1.0))
+
+        tasks_before = len(asyncio.all_tasks())
+        scheduler.start()
+        tasks_running = len(asyncio.all_tasks()) - tasks_before
+        expected = BAN_COUNT - len(cancelled)
+        deadline = time.monotonic() + 15
+        while len(expired) < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.1) # Nothing further may arrive
+        for task in scheduler._tasks: task.cancel()
+        print(f"{BAN_COUNT} bans: {scheduler.wakeups} wakeups, {memory / BAN_COUNT:.0f} bytes per scheduled ban")
+        return set(keys) - cancelled, tasks_running, scheduler.wakeups, memory
+
+    expected_keys, tasks_running, wakeups, memory = asyncio.run(scenario())
+
+    assert len(expired) == len(expected_keys)
+    assert set(expired) == expected_keys
+    # One runner plus the worker pool, not a sleeping task per ban
+    assert tasks_running == bot.BAN_EXPIRY_WORKERS + 1
+    # Due bans are drained in batches, so the runner wakes far less often than there are bans
+    assert wakeups < BAN_COUNT // 10
+    assert memory / BAN_COUNT < 1024
+
+
+def test_rescheduling_an_earlier_deadline_wakes_the_runner():
+    expired = []
+
+    async def on_expire(guild_id, user_id):
+        expired.append((guild_id, user_id, time.monotonic()))
+
+    async def scenario():
+        scheduler = bot.BanScheduler(on_expire, 1)
+        scheduler.schedule((1, 1), time.time() + 3600)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        scheduler.schedule((1, 2), time.time() + 0.1)
+        while not expired and time.monotonic() - started < 2:
+            await asyncio.sleep(0.01)
+        for task in scheduler._tasks: task.cancel()
+        return started
+
+    started = asyncio.run(scenario())
+
+    assert [key[:2] for key in expired] == [(1, 2)]
+    assert expired[0][2] - started < 1
@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import random
+from unittest.mock import AsyncMock, Mock
+
+import discord
+
+import bot
+
+_guild_ids = itertools.count(1000)
+
+
+def make_guild(members=None, roles=None):
+    guild = Mock()
+    guild.id = next(_guild_ids)
+    guild.roles = roles if roles is not None else []
+    guild.get_member = lambda user_id: (members or {}).get(user_id)
+    guild.get_role = lambda role_id: next((r for r in guild.roles if r.id == role_id), None)
+    guild.me.guild_permissions.manage_roles = True
+    return guild
+
+
+def make_interaction(guild, user_id):
+    interaction = Mock()
+    interaction.guild = guild
+    interaction.user = Mock(spec=discord.Member, id=user_id)
+    interaction.channel = None
+    interaction.response.send_message = AsyncMock()
+    return interaction
+
+
+def make_role(role_id, name):
+    role = Mock(spec=discord.Role, id=role_id)
+    role.name = name
+    role.is_default.return_value = False
+    return role
+
+
+def model_click(main, reserve, max_slots, action, user_id):
+    """Reference semantics of the three list buttons on plain lists."""
+    if action == "add":
+        if user_id in main: return
+        if len(main) < max_slots:
+            if user_id in reserve: reserve.remove(user_id)
+            main.append(user_id)
+        elif user_id not in reserve:
+            reserve.append(user_id)
+    elif action == "remove":
+        if user_id in main:
+            main.remove(user_id)
+            if reserve: main.append(reserve.pop(0))
+        elif user_id in reserve:
+            reserve.remove(user_id)
+    else:
+        if user_id in reserve: return
+        if user_id in main: main.remove(user_id)
+        reserve.append(user_id)
+
+
+def drop_list(manager, list_id):
+    record = manager.lists_data.pop(list_id)
+    manager._guild_lists.pop(record["guild_id"], None)
+
+
+async def settle():
+    # Lets the background renderer and role workers finish before the loop closes
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    if pending: await asyncio.wait(pending, timeout=5)
+
+
+def test_ordered_membership_matches_a_plain_list():
+    rng = random.Random(14)
+    members, model = bot.OrderedMembership(), []
+    for _ in range(5000):
+        user_id = rng.randrange(50)
+        op = rng.random()
+        if op < 0.5:
+            members.append(user_id)
+            if user_id not in model: model.append(user_id)
+        elif op < 0.8 and user_id in model:
+            members.remove(user_id)
+            model.remove(user_id)
+        elif model:
+            assert members.pop_first() == model.pop(0)
+        assert members.to_json() == model
+        assert len(members) == len(model)
+    assert all(members.position(uid) == i for i, uid in enumerate(model, 1))
+
+
+def test_concurrent_clicks_keep_list_invariants():
+    manager = bot.list_manager
+    actions = {"add": manager.add_user, "remove": manager.remove_user, "move": manager.move_to_reserve}
+    rng = random.Random(13)
+    clicks = [(rng.choice(list(actions)), rng.randrange(60)) for _ in range(800)]
+
+    async def scenario():
+        guild = make_guild()
+        list_id, list_data = manager.create_list(guild.id, max_slots=15)
+        interactions = [make_interaction(guild, user_id) for _, user_id in clicks]
+        await asyncio.gather(*(actions[action](list_id, user_id, interaction)
+                               for (action, user_id), interaction in zip(clicks, interactions)))
+        await settle()
+        main, reserve = list_data["main"].to_json(), list_data["reserve"].to_json()
+        drop_list(manager, list_id)
+        return main, reserve, interactions
+
+    main, reserve, interactions = asyncio.run(scenario())
+
+    assert len(main) <= 15
+    assert not set(main) & set(reserve)
+    assert len(set(main)) == len(main) and len(set(reserve)) == len(reserve)
+    # Every click is answered exactly once, straight after its in-memory change
+    assert all(i.response.send_message.await_count == 1 for i in interactions)
+    # The clicks never interleave, so the result equals applying them one by one
+    model_main, model_reserve = [], []
+    for action, user_id in clicks:
+        model_click(model_main, model_reserve, 15, action, user_id)
+    assert (main, reserve) == (model_main, model_reserve)
+
+
+def test_joining_two_lists_at_once_keeps_both_roles():
+    manager = bot.list_manager
+    member = Mock(spec=discord.Member, id=42, display_name="member")
+    member.roles = [make_role(1, "@everyone")]
+    member.roles[0].is_default.return_value = True
+    member.edit = AsyncMock()
+
+    async def scenario():
+        guild = make_guild(members={42: member})
+        first_id, first = manager.create_list(guild.id)
+        second_id, second = manager.create_list(guild.id)
+        guild.roles = [make_role(10 + i, name) for i, name in enumerate([*first["roles"].values(), *second["roles"].values()])]
+        await asyncio.gather(manager.add_user(first_id, 42, make_interaction(guild, 42)),
+                             manager.add_user(second_id, 42, make_interaction(guild, 42)))
+        await settle()
+        for list_id in (first_id, second_id):
+            drop_list(manager, list_id)
+        return {first["roles"]["main"], second["roles"]["main"]}
+
+    expected_roles = asyncio.run(scenario())
+
+    assert member.edit.await_count == 1
+    assert {role.name for role in member.edit.await_args.kwargs["roles"]} == expected_roles
+
+
+def test_render_scheduler_coalesces_and_counts_real_edits():
+    renders = []
+
+    async def render(list_id):
+        renders.append(list_id)
+        return len(renders) == 1 # Only the first render changes the message
+
+    async def scenario():
+        scheduler = bot.ListRenderScheduler(render, 0.05)
+        for _ in range(200):
+            scheduler.request("a")
+            await asyncio.sleep(0)
+        await settle()
+        await asyncio.sleep(0.1)
+        scheduler.request("a")
+        await settle()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+
+    assert scheduler.requested == 201
+    assert len(renders) == scheduler.sent + scheduler.unchanged + scheduler.failed
+    assert len(renders) <= 3
+    assert scheduler.sent == 1
+
+
+def test_reposting_a_list_journals_the_reset_and_clears_roles():
+    manager = bot.list_manager
+    members = {user_id: Mock(spec=discord.Member, id=user_id, display_name=str(user_id)) for user_id in (1, 2, 3)}
+
+    async def scenario():
+        guild = make_guild(members=members)
+        list_id, list_data = manager.create_list(guild.id, max_slots=2)
+        guild.roles = [make_role(10 + i, name) for i, name in enumerate(list_data["roles"].values())]
+        for member in members.values():
+            member.roles = [guild.roles[0] if member.id < 3 else guild.roles[1]]
+            member.edit = AsyncMock()
+            await manager.add_user(list_id, member.id, make_interaction(guild, member.id))
+        await settle()
+        seq = manager.journal.seq
+        await manager.reset_list(guild, list_id, 5)
+        await settle()
+        events = manager.journal.seq - seq
+        state = (list_data["main"].to_json(), list_data["reserve"].to_json(), list_data["max_slots"])
+        drop_list(manager, list_id)
+        return events, state
+
+    events, state = asyncio.run(scenario())
+
+    assert events == 3
+    assert state == ([], [], 5)
+    assert all(member.edit.await_args.kwargs["roles"] == [] for member in members.values())
+
+
+def test_failed_post_discards_the_new_list():
+    manager = bot.list_manager
+
+    async def scenario():
+        guild = make_guild()
+        channel = Mock(spec=discord.TextChannel)
+        channel.send = AsyncMock(side_effect=discord.HTTPException(Mock(status=500), "boom"))
+        return guild, await manager.start_new_list_programmatic(guild, channel)
+
+    guild, posted = asyncio.run(scenario())
+
+    assert not posted
+    assert manager.guild_list_ids(guild.id) == []
+
+
+def test_render_scheduler_retries_failed_edits():
+    outcomes = [RuntimeError("503"), RuntimeError("503"), True]
+
+    async def render(list_id):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception): raise outcome
+        return outcome
+
+    async def scenario():
+        scheduler = bot.ListRenderScheduler(render, 0.01, retries=3)
+        scheduler.request("a")
+        await settle()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+
+    assert outcomes == []
+    assert (scheduler.failed, scheduler.retried, scheduler.sent) == (2, 2, 1)
+    assert "retried 2" in str(scheduler)
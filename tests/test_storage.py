@@ -0,0 +1,35 @@
+import os
+
+import bot
+
+
+def test_backends_agree_on_none_values_and_popped_keys():
+    stores = {}
+    for name, backend in (("json", bot.JsonStorageBackend()), ("sqlite", bot.SqliteStorageBackend("test_storage.db", []))):
+        store = f"test_storage_{name}.json"
+        data = {"kept": {"slots": 15}, "empty": None, "popped": 1}
+        backend.write(store, data)
+        data.pop("popped")
+        data["cleared"] = None
+        backend.write(store, data, {"popped", "cleared"})
+        stores[name] = backend.load(store)
+
+    assert stores["json"] == stores["sqlite"] == {"kept": {"slots": 15}, "empty": None, "cleared": None}
+
+
+def test_sqlite_export_rewrites_only_changed_stores():
+    changed, untouched = "test_export_changed.json", "test_export_untouched.json"
+    for store in (changed, untouched):
+        bot._write_json_atomic({"a": 1}, store)
+    backend = bot.SqliteStorageBackend("test_export.db", [changed, untouched])
+    mtimes = {store: os.stat(store).st_mtime_ns for store in (changed, untouched)}
+
+    backend.write(changed, {"a": 2}, {"a"})
+    backend.export_legacy_files()
+    assert bot.load_json_file(changed) == {"a": 2}
+    assert os.stat(untouched).st_mtime_ns == mtimes[untouched]
+
+    # Nothing changed since that export, so a second shutdown writes nothing
+    exported = os.stat(changed).st_mtime_ns
+    backend.export_legacy_files()
+    assert os.stat(changed).st_mtime_ns == exported
@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import discord
+
+import bot
+
+
+def make_member(user_id, delay=0.0, error=None):
+    member = Mock(spec=discord.Member, id=user_id)
+
+    async def move_to(channel, reason=None):
+        await asyncio.sleep(delay)
+        if error: raise error
+
+    member.move_to = AsyncMock(side_effect=move_to)
+    return member
+
+
+def test_failing_progress_updates_do_not_stop_the_moves():
+    channel = Mock(spec=discord.VoiceChannel)
+    channel.guild.id = 1
+    members = [make_member(i, error=RuntimeError("gone") if i == 3 else None) for i in range(10)]
+    on_progress = AsyncMock(side_effect=discord.HTTPException(Mock(status=404), "Unknown Webhook"))
+
+    moved, failed = asyncio.run(bot.VoiceMoveDispatcher(3, 0, 0).move_all(members, channel, on_progress))
+
+    assert len(moved) == 9 and failed == [members[3]]
+    assert on_progress.await_count >= 1
+
+
+def test_cancelled_move_all_cancels_pending_moves():
+    channel = Mock(spec=discord.VoiceChannel)
+    channel.guild.id = 2
+    members = [make_member(i, delay=10) for i in range(5)]
+
+    async def scenario():
+        task = asyncio.create_task(bot.VoiceMoveDispatcher(5, 0, 0).move_all(members, channel))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []